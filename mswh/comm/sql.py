@@ -49,14 +49,27 @@ class Sql(object):
         """
 
         cursor = self.db.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        data = dict()
-        for table_name in tables:
-            table_name = table_name[0]
-            data[table_name] = pd.read_sql_query(
-                """ SELECT * FROM '{}' """.format(table_name), self.db
+
+        # read all tables within a single transaction, such that the
+        # read lock is acquired once instead of once per table
+        begin = not self.db.in_transaction
+        if begin:
+            cursor.execute("BEGIN")
+
+        try:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table';"
             )
+            tables = cursor.fetchall()
+            data = dict()
+            for table_name in tables:
+                table_name = table_name[0]
+                data[table_name] = pd.read_sql_query(
+                    """ SELECT * FROM '{}' """.format(table_name), self.db
+                )
+        finally:
+            if begin:
+                self.db.commit()
 
         if close:
             self.db.close()
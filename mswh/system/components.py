@@ -1,14 +1,142 @@
 import logging
+from collections import namedtuple
 
 import numpy as np
 import pandas as pd
 
 from mswh.comm.label_map import SwhLabels
-from mswh.tools.unit_converters import UnitConv
+from mswh.tools.unit_converters import UnitConv, ABS_ZERO, J_PER_WH, S_PER_H
 
 log = logging.getLogger(__name__)
 
 
+def _k_to_c(T):
+    """Converts temperature from Kelvin to degree Celsius
+    without instantiating a unit converter.
+
+    Parameters:
+
+        T: float, array
+            Temperature [K]
+
+    Returns:
+
+        T_C: float, array
+            Temperature [degC]
+    """
+    return np.subtract(T, ABS_ZERO)
+
+
+def _param_components(params, labels):
+    """Lists the components in a parameter table.
+
+    Parameters:
+
+        params: pd df or dict
+            Parameter table with component, parameter and
+            parameter value columns, or a dict with
+            (component, parameter) keys and parameter values
+
+        labels: dict
+            Product labels, SwhLabels().set_prod_labels()
+
+    Returns:
+
+        components: list
+            Component labels in the order of appearance
+    """
+    if isinstance(params, pd.DataFrame):
+        return params[labels["comp"]].unique().tolist()
+
+    return list(dict.fromkeys(comp for comp, param in params.keys()))
+
+
+def _param_values(params, labels, component=None):
+    """Maps parameter labels to parameter values in a single
+    pass through a parameter table.
+
+    Parameters:
+
+        params: pd df or dict
+            Parameter table with component, parameter and
+            parameter value columns, or a dict with
+            (component, parameter) keys and parameter values
+
+        labels: dict
+            Product labels, SwhLabels().set_prod_labels()
+
+        component: str or None
+            If provided, only the parameters of this
+            component are mapped
+
+    Returns:
+
+        values: dict
+            Parameter values by parameter label. If a parameter
+            is listed more than once, the first value is kept.
+    """
+    if isinstance(params, pd.DataFrame):
+        rows = zip(
+            params[labels["comp"]].values,
+            params[labels["param"]].values,
+            params[labels["param_value"]].values,
+        )
+    else:
+        rows = (
+            (comp, param, value) for (comp, param), value in params.items()
+        )
+
+    values = dict()
+
+    for comp, param, value in rows:
+        if ((component is None) or (comp == component)) and (
+            param not in values
+        ):
+            values[param] = value
+
+    return values
+
+
+# result labels of a single tank timestep by TankStep field name,
+# the net heat rate is an internal result without a label
+_TANK_STEP_LABELS = {
+    field: SwhLabels().set_res_labels().get(field, "Q_net")
+    for field in [
+        "t_tank_low",
+        "t_tank_up",
+        "q_net",
+        "q_dump",
+        "q_ovrcool_tank",
+        "q_del_tank",
+        "q_unmet_tank",
+    ]
+}
+
+
+class TankStep(namedtuple("TankStep", _TANK_STEP_LABELS)):
+    """Results of a single timestep of storage tank dynamics,
+    see :func:`Storage.thermal_tank_dynamics
+    <Storage.thermal_tank_dynamics>`. Fields are named after
+    the SwhLabels result label keys.
+
+    Besides by attribute and position, the results can be
+    indexed by result label, e.g.
+    ``res[SwhLabels().set_res_labels()['t_tank_up']]``, and by
+    'Q_net' for the net heat rate, as with a dict.
+    """
+
+    __slots__ = ()
+
+    _label_index = {
+        label: i for i, label in enumerate(_TANK_STEP_LABELS.values())
+    }
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = self._label_index[key]
+        return tuple.__getitem__(self, key)
+
+
 class Converter(object):
     """Contains energy converter models, such as
     solar collectors, electric resistance heaters, gas burners,
@@ -264,10 +392,7 @@ class Converter(object):
         """
         self.__weather = value
         if isinstance(value, pd.DataFrame):
-            self.t_amb = UnitConv(
-                self.weather[self.c["t_amb_C"]].values
-            ).degC_K(unit_in="degC")
-            self.inc_rad = self.weather[self.c["irrad_on_tilt"]].values
+            self.t_amb, self.inc_rad = self._weather_timeseries(value)
             msg = "Assigned weather data timeseries."
             log.info(msg)
 
@@ -281,6 +406,31 @@ class Converter(object):
             )
             log.info(msg.format(self.t_amb, self.inc_rad))
 
+    def _weather_timeseries(self, weather):
+        """Extracts the timeseries used by the converter models
+        from a weather dataframe
+
+        Parameters:
+
+            weather: pd df
+                Weather data timeseries with columns: amb. temp,
+                solar irradiation
+
+        Returns:
+
+            t_amb: array
+                Ambient temperature [K]
+
+            inc_rad: array
+                Incident radiation [W/m2]
+        """
+        t_amb = UnitConv(weather[self.c["t_amb_C"]].values).degC_K(
+            unit_in="degC"
+        )
+        inc_rad = weather[self.c["irrad_on_tilt"]].values
+
+        return t_amb, inc_rad
+
     @property
     def size(self):
         return self.__size
@@ -495,18 +645,40 @@ class Converter(object):
         """
 
         # The formula needs temperatures in Celsius
-        T_wet_bulb_C = UnitConv(T_wet_bulb).degC_K(unit_in="K")
-        T_tank_C = UnitConv(T_tank).degC_K(unit_in="K")
-
-        # Calculate performance factor
-        performance = (
-            C1
-            + C2 * T_wet_bulb_C
-            + C3 * T_wet_bulb_C * T_wet_bulb_C
-            + C4 * T_tank_C
-            + C5 * T_tank_C * T_tank_C
-            + C6 * T_wet_bulb_C * T_tank_C
-        )
+        T_wet_bulb_C = _k_to_c(T_wet_bulb)
+        T_tank_C = _k_to_c(T_tank)
+
+        if np.ndim(T_wet_bulb_C) == 0 and np.ndim(T_tank_C) == 0:
+            # Calculate performance factor for a single timestep
+            performance = (
+                C1
+                + C2 * T_wet_bulb_C
+                + C3 * T_wet_bulb_C * T_wet_bulb_C
+                + C4 * T_tank_C
+                + C5 * T_tank_C * T_tank_C
+                + C6 * T_wet_bulb_C * T_tank_C
+            )
+
+            return performance
+
+        # Accumulate the polynomial terms in place, in the same
+        # order as above, so that arrays are evaluated with a
+        # single scratch buffer instead of a temporary per term
+        T_wet_bulb_C, T_tank_C = np.broadcast_arrays(T_wet_bulb_C, T_tank_C)
+
+        performance = np.multiply(T_wet_bulb_C, C2)
+        performance += C1
+        term = np.multiply(T_wet_bulb_C, C3)
+        term *= T_wet_bulb_C
+        performance += term
+        np.multiply(T_tank_C, C4, out=term)
+        performance += term
+        np.multiply(T_tank_C, C5, out=term)
+        term *= T_tank_C
+        performance += term
+        np.multiply(T_wet_bulb_C, C6, out=term)
+        term *= T_tank_C
+        performance += term
 
         return performance
 
@@ -618,19 +790,13 @@ class Converter(object):
             Q_unmet: float, array
                 Unmet demand heat rate, [W]
         """
-        # start with assuming the heater capacity is infinite
-        Q_del = Q_dem + 0.0
-
-        # limit the delivery if the heater has a limited capacity
-        if Q_nom is not None:
-            if not np.isscalar(Q_dem):
-                Q_del[Q_del > Q_nom] = Q_nom
-            elif np.isscalar(Q_dem):
-                Q_del = min(Q_dem, Q_nom)
-            else:
-                msg = "Heater demand data type {} seems not supported."
-                log.error(msg.format(type(Q_dem)))
-                raise ValueError
+        if Q_nom is None:
+            # the heater capacity is infinite
+            Q_del = Q_dem + 0.0
+        else:
+            # limit the delivery to the heater capacity, this
+            # works alike for a single timestep and for arrays
+            Q_del = np.minimum(Q_dem, Q_nom)
 
         # Unmet demand
         Q_unmet = Q_dem - Q_del
@@ -641,7 +807,9 @@ class Converter(object):
 
         return Q_del, Q_en_use, Q_unmet
 
-    def solar_collector(self, t_in, t_amb=None, inc_rad=None):
+    def solar_collector(
+        self, t_in, t_amb=None, inc_rad=None, weather=None, size=None
+    ):
         """Two commonly used empirical instantaneous collector
         efficiency models based on test data from standard
         test procedures (SRCC, ISO9806), found in
@@ -663,6 +831,16 @@ class Converter(object):
                 Incident radiation (timeseries) [W]
                 Default: None (to use data extracted from the weather df)
 
+            weather: pd df
+                Weather data timeseries to use for this call only,
+                instead of the weather assigned to the instance
+                Default: None
+
+            size: pd df
+                Component sizes to use for this call only, instead
+                of the sizes assigned to the instance
+                Default: None
+
         Returns:
 
             res: dict or floats or arrays
@@ -670,13 +848,23 @@ class Converter(object):
                 {'Q_gain' : Solar gains from the gross collector area, [W]
                  'eff' : Efficiency of solar to heat conversion, [-]
         """
-        try:
-            gross_area = self.size[self.s["sol_col"]]
-        except:
-            gross_area = 1.0
+        if size is not None:
+            gross_area = size.loc[
+                size[self.s["comp"]] == self.s["sol_col"], self.s["cap"]
+            ].values[0]
+        else:
+            try:
+                gross_area = self.size[self.s["sol_col"]]
+            except:
+                gross_area = 1.0
+
+                msg = "Could not extract collector size. " "Setting it to {}."
+                log.info(msg.format(gross_area))
 
-            msg = "Could not extract collector size. " "Setting it to {}."
-            log.info(msg.format(gross_area))
+        if weather is not None:
+            weather_t_amb, weather_inc_rad = self._weather_timeseries(weather)
+        else:
+            weather_t_amb, weather_inc_rad = self.t_amb, self.inc_rad
 
         # if t_in is output of the tank model, solar collector
         # model needs to be simulated step by step. In that
@@ -688,7 +876,7 @@ class Converter(object):
                 "collector gains. This will result in an array calculation."
             )
             log.info(msg)
-            t_amb = self.t_amb
+            t_amb = weather_t_amb
 
         if inc_rad is None:
             msg = (
@@ -696,7 +884,7 @@ class Converter(object):
                 " gains. This will result in an array calculation."
             )
             log.info(msg)
-            inc_rad = self.inc_rad
+            inc_rad = weather_inc_rad
 
         if self.use_defaults:
             msg = (
@@ -781,26 +969,33 @@ class Converter(object):
         # msg = 'Allow div 0.'
         # log.debug(msg)
 
-        # avoid division by zero by creating a copy
-        # of the irradiation data with infinity
-        # instead of zero (see efficiency formula)
-        if not np.isscalar(inc_rad):
-            inc_rad_mod = inc_rad
-            inc_rad_mod[inc_rad == 0] = -np.inf
-        elif np.isscalar(inc_rad):
-            if inc_rad == 0.0:
-                inc_rad_mod = -np.inf
+        if np.isscalar(inc_rad):
+            dt = t_in - t_amb
+
+            if inc_rad > 0.0:
+                # instantaneous collector efficiency, [-]
+                eta = intercept + slope * (dt / inc_rad)
             else:
-                inc_rad_mod = inc_rad
+                # no irradiation, including missing data,
+                # yields no gain, as for arrays below
+                inc_rad = 0.0
+                eta = 0.0 if np.isscalar(dt) else np.zeros(np.shape(dt))
         else:
-            msg = "Solar irradiation data type {} seems not supported."
-            log.error(msg.format(type(inc_rad)))
-            raise ValueError
+            # evaluate the efficiency only where there is any
+            # irradiation, leaving the input data unchanged. Any
+            # other timestep, including missing data, yields no gain
+            dt, inc_rad = np.broadcast_arrays(
+                np.subtract(t_in, t_amb, dtype=np.float64),
+                np.asarray(inc_rad, dtype=np.float64),
+            )
+            irradiated = inc_rad > 0.0
+            inc_rad = np.where(irradiated, inc_rad, 0.0)
 
-        # instantaneous collector efficiency, [-]
-        eta = intercept * (inc_rad != 0.0) + slope * (
-            (t_in - t_amb) / inc_rad_mod
-        )
+            # instantaneous collector efficiency, [-]
+            eta = np.zeros(dt.shape)
+            np.divide(dt, inc_rad, out=eta, where=irradiated)
+            np.multiply(eta, slope, out=eta, where=irradiated)
+            np.add(eta, intercept, out=eta, where=irradiated)
 
         # instantaneous solar gain, [W]
         calc_gain = inc_rad * gross_area * eta
@@ -855,28 +1050,43 @@ class Converter(object):
             a_2: float
                 Rating parameter
         """
-        # avoid division by zero by creating a copy
-        # of the irradiation data with infinity
-        # instead of zero (see efficiency formula)
-        if not np.isscalar(inc_rad):
-            inc_rad_mod = inc_rad
-            inc_rad_mod[inc_rad == 0] = -np.inf
-        elif np.isscalar(inc_rad):
-            if inc_rad == 0.0:
-                inc_rad_mod = -np.inf
+        if np.isscalar(inc_rad):
+            dt = t_in - t_amb
+
+            if inc_rad > 0.0:
+                # instantaneous collector efficiency, [-]
+                eta = (
+                    intercept
+                    + a_1 * (dt / inc_rad)
+                    + a_2 * (dt / inc_rad ** 2)
+                )
             else:
-                inc_rad_mod = inc_rad
+                # no irradiation, including missing data,
+                # yields no gain, as for arrays below
+                inc_rad = 0.0
+                eta = 0.0 if np.isscalar(dt) else np.zeros(np.shape(dt))
         else:
-            msg = "Solar irradiation data type {} seems not supported."
-            log.error(msg.format(type(inc_rad)))
-            raise ValueError
+            # evaluate the efficiency only where there is any
+            # irradiation, leaving the input data unchanged. Any
+            # other timestep, including missing data, yields no gain
+            dt, inc_rad = np.broadcast_arrays(
+                np.subtract(t_in, t_amb, dtype=np.float64),
+                np.asarray(inc_rad, dtype=np.float64),
+            )
+            irradiated = inc_rad > 0.0
+            inc_rad = np.where(irradiated, inc_rad, 0.0)
 
-        # instantaneous collector efficiency, [-]
-        eta = (
-            intercept * (inc_rad != 0.0)
-            + a_1 * ((t_in - t_amb) / inc_rad_mod)
-            + a_2 * ((t_in - t_amb) / inc_rad_mod ** 2)
-        )
+            # instantaneous collector efficiency, [-]
+            eta = np.zeros(dt.shape)
+            np.divide(dt, inc_rad, out=eta, where=irradiated)
+            np.multiply(eta, a_1, out=eta, where=irradiated)
+            np.add(eta, intercept, out=eta, where=irradiated)
+
+            term = np.zeros(dt.shape)
+            np.square(inc_rad, out=term, where=irradiated)
+            np.divide(dt, term, out=term, where=irradiated)
+            np.multiply(term, a_2, out=term, where=irradiated)
+            eta += term
 
         # instantaneous solar gain, [W]
         calc_gain = inc_rad * gross_area * np.nan_to_num(eta)
@@ -891,7 +1101,9 @@ class Converter(object):
 
         return gain, eta
 
-    def photovoltaic(self, use_p_peak=True, inc_rad=None):
+    def photovoltaic(
+        self, use_p_peak=True, inc_rad=None, weather=None, size=None
+    ):
         """Photovoltaic model
 
         Parameters:
@@ -900,6 +1112,20 @@ class Converter(object):
                 Boolean flag determining if peak power is used for sizing
                 the pv panel (instead of area and efficiency)
 
+            inc_rad: float, array
+                Incident radiation (timeseries) [W/m2]
+                Default: None (to use data extracted from the weather df)
+
+            weather: pd df
+                Weather data timeseries to use for this call only,
+                instead of the weather assigned to the instance
+                Default: None
+
+            size: pd df
+                Component sizes to use for this call only, instead
+                of the sizes assigned to the instance
+                Default: None
+
         Returns:
 
             self.pv_power: dict of floats
@@ -908,16 +1134,23 @@ class Converter(object):
                 * 'ac' : AC
                 * 'dc' : DC
         """
-        try:
-            panel_size = self.size[self.s["pv"]]
-
-        except:
-            # default to 1000. kW_peak or it's equivalent in m2 for
-            # default efficiency
-            panel_size = 1000.0 if use_p_peak else 6.25
-            log.info(
-                "Could not get panel size. Setting it to {}".format(panel_size)
-            )
+        if size is not None:
+            panel_size = size.loc[
+                size[self.s["comp"]] == self.s["pv"], self.s["cap"]
+            ].values[0]
+        else:
+            try:
+                panel_size = self.size[self.s["pv"]]
+
+            except:
+                # default to 1000. kW_peak or it's equivalent in m2 for
+                # default efficiency
+                panel_size = 1000.0 if use_p_peak else 6.25
+                log.info(
+                    "Could not get panel size. Setting it to {}".format(
+                        panel_size
+                    )
+                )
 
         # Set panel size according to use_p_peak value
         if use_p_peak:
@@ -939,7 +1172,10 @@ class Converter(object):
                 " gains. This will result in an array calculation."
             )
             log.info(msg)
-            inc_rad = self.inc_rad
+            if weather is not None:
+                inc_rad = weather[self.c["irrad_on_tilt"]].values
+            else:
+                inc_rad = self.inc_rad
 
         # if no input parameters have been passed to the class
         if self.use_defaults:
@@ -1135,62 +1371,52 @@ class Storage(object):
 
         self.timestep = timestep  # [h]
 
-        if isinstance(params, pd.DataFrame):
+        if isinstance(params, (pd.DataFrame, dict)):
 
             self.components = []
             # get all components of the project level system
-            components = params[self.s["comp"]].unique().tolist()
+            components = _param_components(params, self.s)
 
             if self.s["the_sto"] in components:
 
                 self.components.append(self.s["the_sto"])
 
-                comp_params = params.loc[
-                    params[self.s["comp"]] == self.s["the_sto"], :
-                ]
+                param_values = _param_values(params, self.s)
 
                 params_sol_tank = dict()
 
-                params_sol_tank[self.s["ins_thi"]] = params.loc[
-                    params[self.s["param"]] == self.s["ins_thi"],
-                    self.s["param_value"],
-                ].values[0]
+                params_sol_tank[self.s["ins_thi"]] = param_values[
+                    self.s["ins_thi"]
+                ]
 
-                params_sol_tank[self.s["spec_hea_con"]] = params.loc[
-                    params[self.s["param"]] == self.s["spec_hea_con"],
-                    self.s["param_value"],
-                ].values[0]
+                params_sol_tank[self.s["spec_hea_con"]] = param_values[
+                    self.s["spec_hea_con"]
+                ]
 
-                params_sol_tank[self.s["f_upper_vol"]] = params.loc[
-                    params[self.s["param"]] == self.s["f_upper_vol"],
-                    self.s["param_value"],
-                ].values[0]
+                params_sol_tank[self.s["f_upper_vol"]] = param_values[
+                    self.s["f_upper_vol"]
+                ]
 
-                params_sol_tank[self.s["h_vs_r"]] = params.loc[
-                    params[self.s["param"]] == self.s["h_vs_r"],
-                    self.s["param_value"],
-                ].values[0]
+                params_sol_tank[self.s["h_vs_r"]] = param_values[
+                    self.s["h_vs_r"]
+                ]
 
-                params_sol_tank[self.s["dt_appr"]] = params.loc[
-                    params[self.s["param"]] == self.s["dt_appr"],
-                    self.s["param_value"],
-                ].values[0]
+                params_sol_tank[self.s["dt_appr"]] = param_values[
+                    self.s["dt_appr"]
+                ]
 
-                params_sol_tank[self.s["t_max_tank"]] = params.loc[
-                    params[self.s["param"]] == self.s["t_max_tank"],
-                    self.s["param_value"],
-                ].values[0]
+                params_sol_tank[self.s["t_max_tank"]] = param_values[
+                    self.s["t_max_tank"]
+                ]
 
-                params_sol_tank[self.s["t_tap_set"]] = params.loc[
-                    params[self.s["param"]] == self.s["t_tap_set"],
-                    self.s["param_value"],
-                ].values[0]
+                params_sol_tank[self.s["t_tap_set"]] = param_values[
+                    self.s["t_tap_set"]
+                ]
 
                 if type == "sol_tank":
-                    params_sol_tank[self.s["eta_coil"]] = params.loc[
-                        params[self.s["param"]] == self.s["eta_coil"],
-                        self.s["param_value"],
-                    ].values[0]
+                    params_sol_tank[self.s["eta_coil"]] = param_values[
+                        self.s["eta_coil"]
+                    ]
                 elif type == "hp_tank":
                     # based on the model definition (net performance of
                     # an inbuilt heat pump)
@@ -1225,31 +1451,27 @@ class Storage(object):
 
                 self.components.append(self.s["gas_tank"])
 
-                comp_params = params.loc[
-                    params[self.s["comp"]] == self.s["gas_tank"], :
-                ]
+                gas_tank_values = _param_values(
+                    params, self.s, component=self.s["gas_tank"]
+                )
 
                 params_gas_tank_wh = dict()
 
-                params_gas_tank_wh[self.s["tank_re"]] = comp_params.loc[
-                    params[self.s["param"]] == self.s["tank_re"],
-                    self.s["param_value"],
-                ].values[0]
+                params_gas_tank_wh[self.s["tank_re"]] = gas_tank_values[
+                    self.s["tank_re"]
+                ]
 
-                params_gas_tank_wh[self.s["ins_thi"]] = comp_params.loc[
-                    params[self.s["param"]] == self.s["ins_thi"],
-                    self.s["param_value"],
-                ].values[0]
+                params_gas_tank_wh[self.s["ins_thi"]] = gas_tank_values[
+                    self.s["ins_thi"]
+                ]
 
-                params_gas_tank_wh[self.s["spec_hea_con"]] = comp_params.loc[
-                    params[self.s["param"]] == self.s["spec_hea_con"],
-                    self.s["param_value"],
-                ].values[0]
+                params_gas_tank_wh[self.s["spec_hea_con"]] = gas_tank_values[
+                    self.s["spec_hea_con"]
+                ]
 
-                params_gas_tank_wh[self.s["t_tap_set"]] = comp_params.loc[
-                    params[self.s["param"]] == self.s["t_tap_set"],
-                    self.s["param_value"],
-                ].values[0]
+                params_gas_tank_wh[self.s["t_tap_set"]] = gas_tank_values[
+                    self.s["t_tap_set"]
+                ]
 
                 self.size = size
 
@@ -1450,6 +1672,11 @@ class Storage(object):
 
         # volume
         self.V = self.size
+        # heat capacities of the lower, upper and whole
+        # tank volume, J/K
+        self.C_lower = self.V_lower * self.ro * self.shc
+        self.C_upper = self.V_upper * self.ro * self.shc
+        self.C = self.V * self.ro * self.shc
 
         # For tanks with a gas heater input:
         if gas_heater_autosize:
@@ -1469,8 +1696,9 @@ class Storage(object):
         # areas to calculate thermal losses to environment
         # e.g. to apply for a solar indirect tank
         if split_tank:
-            self.A_lower = self._tank_area()["lower"]
-            self.A_upper = self._tank_area()["upper"]
+            areas = self._tank_area()
+            self.A_lower = areas["lower"]
+            self.A_upper = areas["upper"]
             self.A = self.A_lower + self.A_upper
         # e.g. to apply to the gas tank WH WHAM model
         else:
@@ -1534,8 +1762,9 @@ class Storage(object):
 
         Returns:
 
-            res: dict of floats
-                Represent averages in a single timestep.
+            res: TankStep of floats
+                Represent averages in a single timestep,
+                indexable by result label as a dict.
                 Average temperatures for tank volumes:
 
                 * self.r[self.r['t_tank_low']] : lower, K
@@ -1571,7 +1800,7 @@ class Storage(object):
 
         # Get net heat gain/loss in a single timestep in J,
         # assuming timestep given in h!
-        dE = UnitConv(dQ * self.timestep).Wh_J(unit_in="Wh")
+        dE = dQ * self.timestep * J_PER_WH
 
         # Distribution of the net heat gain/loss
 
@@ -1632,15 +1861,9 @@ class Storage(object):
             raise Exception
 
         # pack results
-        res = {
-            self.r["t_tank_low"]: T_lower,
-            self.r["t_tank_up"]: T_upper,
-            "Q_net": dQ,
-            self.r["q_dump"]: Q_dump,
-            self.r["q_ovrcool_tank"]: Q_overcool,
-            self.r["q_del_tank"]: Q_del,
-            self.r["q_unmet_tank"]: Q_unmet,
-        }
+        res = TankStep(
+            T_lower, T_upper, dQ, Q_dump, Q_overcool, Q_del, Q_unmet
+        )
 
         return res
 
@@ -1687,7 +1910,7 @@ class Storage(object):
 
             # Temperature increase to upper volume that would
             # be achieved should all the gain be allocated to it
-            dT_upper = dE / (self.V_upper * self.ro * self.shc)
+            dT_upper = dE / self.C_upper
 
             # Nonetheless, allow heating only up to the predefined
             # charging temperature difference between the upper
@@ -1715,7 +1938,7 @@ class Storage(object):
             # get the lower volume up to
             # pre_T_upper - self.dT_approach
             dT_lower_max = (pre_T_upper - self.dT_approach) - pre_T_lower
-            dT_lower = dE / (self.V_lower * self.ro * self.shc)
+            dT_lower = dE / self.C_lower
 
             if dT_lower <= dT_lower_max:
                 T_lower = pre_T_lower + dT_lower
@@ -1802,7 +2025,7 @@ class Storage(object):
 
             # theoretical temperature reduction if it would be
             # possible to satisfy the entire loss from the tank volume
-            dT = -1.0 * (dE / (self.V * self.ro * self.shc))
+            dT = -1.0 * (dE / self.C)
 
             # maximum possible temperature reduction to the lower volume
             dT_lower_max = max(0.0, (pre_T_lower - pre_T_min))
@@ -1830,12 +2053,9 @@ class Storage(object):
                     T_upper -= dT_upper_max
 
                     Q_unmet = (
-                        UnitConv(
-                            (
-                                (dT_upper - dT_upper_max)
-                                * (self.V_upper * self.ro * self.shc)
-                            )
-                        ).Wh_J(unit_in="J")
+                        (dT_upper - dT_upper_max)
+                        * self.C_upper
+                        / J_PER_WH
                         / self.timestep
                     )
                     Q_del -= Q_unmet
@@ -1855,7 +2075,7 @@ class Storage(object):
             # See what would be the temperature difference
             # should all the heat be lost from the lower
             # part of the tank
-            dT_lower_max = dE / (self.V_lower * self.ro * self.shc)
+            dT_lower_max = dE / self.C_lower
 
             # allow cooling off of the lower part of the tank
             # either for the full amount of losses or down
@@ -1946,18 +2166,18 @@ class Storage(object):
         """
         # The thermostat got triggered!
         # Get the excess heat and stop charging the tank
-        E_dump = (self.V_upper * self.ro * self.shc) * (T_upper - self.T_max)
+        E_dump = self.C_upper * (T_upper - self.T_max)
         T_upper = self.T_max
         # Was the charge high enough to overcharge the
         # lower part of the tank as well?
         if T_lower > (self.T_max - self.dT_approach):
-            E_dump += (self.V_lower * self.ro * self.shc) * (
+            E_dump += self.C_lower * (
                 T_lower - (self.T_max - self.dT_approach)
             )
             T_lower = self.T_max - self.dT_approach
 
         # Convert to average timestep heat rate
-        Q_dump = UnitConv(E_dump).Wh_J(unit_in="J") / self.timestep
+        Q_dump = E_dump / J_PER_WH / self.timestep
 
         return T_upper, T_lower, Q_dump
 
@@ -2030,7 +2250,7 @@ class Storage(object):
             )
         )
 
-        Q_overcool = UnitConv(E_overcool).Wh_J(unit_in="J") / self.timestep
+        Q_overcool = E_overcool / J_PER_WH / self.timestep
 
         if discharge:
             # set the achieved tank temperature
@@ -2373,10 +2593,18 @@ class Storage(object):
         # Get nominal draw temperature
         T_draw_nom = self.T_draw_set
 
+        if any(
+            np.ndim(x) > 0
+            for x in (V_draw_load, T_tank, T_feed, dT_loss, T_draw_min)
+        ):
+            V_tap = self._tap_volume(
+                V_draw_load, T_tank, T_feed, T_draw_nom, dT_loss, T_draw_min
+            )
+
         # draw a volume with the same heat content as
         # the required load. Enthalpy balance,
         # assuming c and ro constant
-        if T_tank > (T_draw_nom + dT_loss):
+        elif T_tank > (T_draw_nom + dT_loss):
             V_tap = (
                 V_draw_load
                 * (T_draw_nom + dT_loss - T_feed)
@@ -2396,42 +2624,31 @@ class Storage(object):
             log.error(msg.format(dT_loss, T_tank, T_draw_nom))
             raise Exception
 
-        if T_draw_min is not None:
+        if (T_draw_min is not None) and (np.ndim(V_tap) == 0):
 
             if T_tank <= T_draw_min:
                 # do not draw
                 V_tap = 0.0
 
         Q_dem = (
-            UnitConv(V_draw_load).m3perh_m3pers(unit_in="m3perh")
-            * self.ro
-            * self.shc
-            * (T_draw_nom - T_feed)
+            V_draw_load / S_PER_H * self.ro * self.shc * (T_draw_nom - T_feed)
         )
 
         Q_dem_with_dist_loss = (
-            UnitConv(V_draw_load).m3perh_m3pers(unit_in="m3perh")
+            V_draw_load
+            / S_PER_H
             * self.ro
             * self.shc
             * (T_draw_nom + dT_loss - T_feed)
         )
 
-        Q_tap = (
-            UnitConv(V_tap).m3perh_m3pers(unit_in="m3perh")
-            * self.ro
-            * self.shc
-            * (T_tank - T_feed)
-        )
+        Q_tap = V_tap / S_PER_H * self.ro * self.shc * (T_tank - T_feed)
 
-        # rounding
-        try:  # array
-            Q_dem = Q_dem.round(2)
-            Q_dem_with_dist_loss = Q_dem_with_dist_loss.round(2)
-            Q_tap = Q_tap.round(2)
-        except:  # float
-            Q_dem = round(Q_dem, 2)
-            Q_dem_with_dist_loss = round(Q_dem_with_dist_loss, 2)
-            Q_tap = round(Q_tap, 2)
+        # rounding, each value may be an array or a float
+        Q_dem, Q_dem_with_dist_loss, Q_tap = (
+            x.round(2) if hasattr(x, "round") else round(x, 2)
+            for x in (Q_dem, Q_dem_with_dist_loss, Q_tap)
+        )
 
         Q_unmet = Q_dem_with_dist_loss - Q_tap
 
@@ -2445,6 +2662,75 @@ class Storage(object):
 
         return tap
 
+    @staticmethod
+    def _tap_volume(
+        V_draw_load, T_tank, T_feed, T_draw_nom, dT_loss=0.0, T_draw_min=None
+    ):
+        """Array version of the tap volume calculation in
+        `tap`, evaluating all timesteps at once.
+
+        Parameters:
+
+            V_draw_load: float or array, m3/h
+                Volume of DHW drawn at the nominal
+                end-use load temperature.
+
+            T_tank: float or array, K
+                Tank node temperature from which the
+                DHW is being tapped
+
+            T_feed: float or array, K
+                Temperature of water heater inlet water
+
+            T_draw_nom: float, K
+                Nominal draw temperature
+
+            dT_loss: float or array, K
+                Distribution loss temperature difference
+
+            T_draw_min: float or array, K
+                Minimal tank temperature that allows
+                tapping. Default: None
+
+        Returns:
+
+            V_tap: array, m3/h
+                Draw volume
+        """
+        T_draw = np.add(T_draw_nom, dT_loss)
+        above = np.greater(T_tank, T_draw)
+
+        if not (above | np.less_equal(T_tank, T_draw)).all():
+            msg = (
+                "Not able to calculate V_tap based on: "
+                "dT_loss = {}, T_tank = {}, T_draw_nom = {}"
+            )
+            log.error(msg.format(dT_loss, T_tank, T_draw_nom))
+            raise Exception
+
+        inputs = [V_draw_load, T_tank, T_feed, T_draw]
+        if T_draw_min is not None:
+            inputs.append(T_draw_min)
+
+        shape = np.broadcast(*inputs).shape
+
+        # draw the demand volume if the tank temperature
+        # is below or just at the nominal draw temperature,
+        # otherwise the volume with the same heat content
+        V_tap = np.array(np.broadcast_to(V_draw_load, shape), dtype=float)
+        np.divide(
+            V_tap * np.subtract(T_draw, T_feed),
+            np.subtract(T_tank, T_feed),
+            out=V_tap,
+            where=above,
+        )
+
+        if T_draw_min is not None:
+            # do not draw
+            np.copyto(V_tap, 0.0, where=np.less_equal(T_tank, T_draw_min))
+
+        return V_tap
+
     @staticmethod
     def _thermal_transmittance(insul_thickness=0.04, spec_hea_cond=0.04):
         """Returns the coefficient
@@ -2561,8 +2847,6 @@ class Storage(object):
             sizing rules, since the WHAM model does not apply to
             tanks that are not appropriately sized.
         """
-        res = dict()
-
         Q_del, Q_gas_use = self._gas_tank_wh(
             Q_nom=self.Q_nom,
             V_draw=V_draw,
@@ -2672,28 +2956,18 @@ class Storage(object):
             ratios and will not perform as expected outside
             those.
         """
-        dT = T_set - T_feed
-        try:  # array
-            dT[dT < 0.0] = 0.0
-        except:  # float
-            dT = max(dT, 0.0)
+        # feed water above the setpoint is not cooled down
+        dT = np.maximum(T_set - T_feed, 0.0)
 
         # heat delivered to user
-        Q_del = (
-            UnitConv(V_draw).m3perh_m3pers(unit_in="m3perh")
-            * water_density
-            * water_specheat
-            * dT
-        )
+        Q_del = V_draw / S_PER_H * water_density * water_specheat * dT
 
         # energy content of the hot water drawn
         consumption_rate = Q_del / tank_re
-        # to avoid double counting of the loss amount
-        thermal_loss_adjustment = 1.0 - (
-            tank_U * tank_A * (T_set - T_amb) / Q_nom
-        )
         # thermal loss rate
         thermal_loss_rate = tank_U * tank_A * (T_set - T_amb)
+        # to avoid double counting of the loss amount
+        thermal_loss_adjustment = 1.0 - thermal_loss_rate / Q_nom
 
         # Average timestep gas use rate in W
         Q_gas_use = (
@@ -2848,7 +3122,7 @@ class Distribution(object):
             self.shc = 4180.0  # J/(kgK)
 
         # extract component parameters
-        if isinstance(params, pd.DataFrame):
+        if isinstance(params, (pd.DataFrame, dict)):
 
             self.use_defaults = False
 
@@ -2857,7 +3131,9 @@ class Distribution(object):
 
             # components are listed n the label map - extract each if
             # present in this list:
-            components = params[self.s["comp"]].unique().tolist()
+            components = _param_components(params, self.s)
+
+            param_values = _param_values(params, self.s)
 
             if self.s["sol_pump"] in components:
 
@@ -2865,71 +3141,64 @@ class Distribution(object):
 
                 self.params_sol_pump = dict()
 
-                self.params_sol_pump[self.s["eta_sol_pump"]] = params.loc[
-                    params[self.s["param"]] == self.s["eta_sol_pump"],
-                    self.s["param_value"],
-                ].values[0]
+                self.params_sol_pump[self.s["eta_sol_pump"]] = param_values[
+                    self.s["eta_sol_pump"]
+                ]
 
             if self.s["dist_pump"] in components:
                 self.components.append(self.s["dist_pump"])
 
                 self.params_dist_pump = dict()
 
-                self.params_dist_pump[self.s["eta_dist_pump"]] = params.loc[
-                    params[self.s["param"]] == self.s["eta_dist_pump"],
-                    self.s["param_value"],
-                ].values[0]
+                self.params_dist_pump[self.s["eta_dist_pump"]] = param_values[
+                    self.s["eta_dist_pump"]
+                ]
 
             if self.s["piping"] in components:
                 self.components.append(self.s["piping"])
 
                 self.params_piping = dict()
 
-                self.params_piping[self.s["pipe_spec_hea_con"]] = params.loc[
-                    params[self.s["param"]] == self.s["pipe_spec_hea_con"],
-                    self.s["param_value"],
-                ].values[0]
+                self.params_piping[self.s["pipe_spec_hea_con"]] = param_values[
+                    self.s["pipe_spec_hea_con"]
+                ]
 
-                self.params_piping[self.s["pipe_ins_thick"]] = params.loc[
-                    params[self.s["param"]] == self.s["pipe_ins_thick"],
-                    self.s["param_value"],
-                ].values[0]
+                self.params_piping[self.s["pipe_ins_thick"]] = param_values[
+                    self.s["pipe_ins_thick"]
+                ]
 
-                self.params_piping[self.s["dia_len_exp"]] = params.loc[
-                    params[self.s["param"]] == self.s["dia_len_exp"],
-                    self.s["param_value"],
-                ].values[0]
+                self.params_piping[self.s["dia_len_exp"]] = param_values[
+                    self.s["dia_len_exp"]
+                ]
 
-                self.params_piping[self.s["dia_len_sca"]] = params.loc[
-                    params[self.s["param"]] == self.s["dia_len_sca"],
-                    self.s["param_value"],
-                ].values[0]
+                self.params_piping[self.s["dia_len_sca"]] = param_values[
+                    self.s["dia_len_sca"]
+                ]
+
+                # discrete diameters may be passed as a string, as
+                # read from the database, or as a sequence of floats
+                discr_diam_m = param_values[self.s["discr_diam_m"]]
+
+                if isinstance(discr_diam_m, str):
+                    discr_diam_m = eval(discr_diam_m)
 
-                self.params_piping[self.s["discr_diam_m"]] = eval(
-                    np.array(
-                        params.loc[
-                            params[self.s["param"]] == self.s["discr_diam_m"],
-                            self.s["param_value"],
-                        ]
-                    )[0]
+                self.params_piping[self.s["discr_diam_m"]] = np.array(
+                    discr_diam_m, dtype=float
                 )
 
-                self.params_piping[self.s["flow_factor"]] = params.loc[
-                    params[self.s["param"]] == self.s["flow_factor"],
-                    self.s["param_value"],
-                ].values[0]
+                self.params_piping[self.s["flow_factor"]] = param_values[
+                    self.s["flow_factor"]
+                ]
 
-                self.params_piping[self.s["circ"]] = params.loc[
-                    params[self.s["param"]] == self.s["circ"],
-                    self.s["param_value"],
-                ].values[0]
+                self.params_piping[self.s["circ"]] = param_values[
+                    self.s["circ"]
+                ]
 
-                self.params_piping[self.s["long_br_len_fr"]] = params.loc[
-                    params[self.s["param"]] == self.s["long_br_len_fr"],
-                    self.s["param_value"],
-                ].values[0]
+                self.params_piping[self.s["long_br_len_fr"]] = param_values[
+                    self.s["long_br_len_fr"]
+                ]
 
-        elif not isinstance(params, pd.DataFrame):
+        else:
             self.use_defaults = True
 
         self.timestep = timestep
@@ -3274,7 +3543,29 @@ class Distribution(object):
             dT_drop: float, K
                 Estimated temperature drop through the
                 entire length of the pipe
+
+            flow_on_timestep_fraction: float
+                Fraction of the timestep during which
+                the water flows through the pipe
+
+            For array-like T_in, T_amb or V_tap all
+            returns are arrays, see `_pipe_losses_array`.
         """
+        if any(np.ndim(x) > 0 for x in (T_in, T_amb, V_tap)):
+            return self._pipe_losses_array(
+                T_in=T_in,
+                T_amb=T_amb,
+                length=length,
+                diameter=diameter,
+                insul_thickness=insul_thickness,
+                spec_hea_cond=spec_hea_cond,
+                V_tap=V_tap,
+                max_V_tap=max_V_tap,
+                flow_factor=flow_factor,
+                circulation=circulation,
+                longest_branch_length_ratio=longest_branch_length_ratio,
+            )
+
         if length > 0.0:
             U_value = spec_hea_cond / insul_thickness
 
@@ -3351,6 +3642,110 @@ class Distribution(object):
 
         return loss_heat_rate, heat_loss, dT_drop, flow_on_timestep_fraction
 
+    def _pipe_losses_array(
+        self,
+        T_in,
+        T_amb,
+        length,
+        diameter,
+        insul_thickness,
+        spec_hea_cond,
+        V_tap,
+        max_V_tap,
+        flow_factor,
+        circulation,
+        longest_branch_length_ratio,
+    ):
+        """Evaluates `_pipe_losses` for all timesteps at once,
+        masking the timesteps without any flow instead of
+        branching on them.
+
+        See :func:`_pipe_losses <_pipe_losses>` method
+        for parameters and returns description. All
+        returns are arrays of the broadcast input shape.
+        """
+        shape = np.broadcast(T_in, T_amb, V_tap).shape
+
+        loss_heat_rate = np.zeros(shape)
+        heat_loss = np.zeros(shape)
+        dT_drop = np.zeros(shape)
+        flow_on_timestep_fraction = np.zeros(shape)
+
+        if not length > 0.0:
+            return (
+                loss_heat_rate,
+                heat_loss,
+                dT_drop,
+                flow_on_timestep_fraction,
+            )
+
+        U_value = spec_hea_cond / insul_thickness
+
+        # fraction of timestep during which the flow was on
+        if int(circulation) > 0.0:
+            flow_on = np.ones(shape)
+            # assuming constant nominal speed circulation
+            V_tap = np.full(shape, max_V_tap / flow_factor)
+        else:
+            V_tap = np.broadcast_to(V_tap, shape)
+            flow_on = V_tap * flow_factor / max_V_tap
+
+        on = V_tap > 0.0
+
+        # effective flowrate [in m3/s]
+        V_eff = np.divide(V_tap, flow_on, out=np.zeros(shape), where=on)
+        V_eff /= 3600.0
+
+        if longest_branch_length_ratio is not None:
+            length_eff = longest_branch_length_ratio * length
+        else:
+            length_eff = length * 1.0
+
+        area_for_t_avg = (diameter + 2 * insul_thickness) * np.pi * length_eff
+
+        # average pipe temperature
+        heat_capacity_rate = self.ro * V_eff * self.shc
+        k = np.divide(
+            U_value * area_for_t_avg,
+            heat_capacity_rate,
+            out=np.zeros(shape),
+            where=on,
+        )
+        k_factor = np.divide(
+            1.0 - np.exp(-k), k, out=np.zeros(shape), where=on
+        )
+        T_avg = (T_in - T_amb) * k_factor + T_amb
+
+        np.copyto(
+            loss_heat_rate,
+            self._pipe_loss_rate(
+                T_avg=T_avg,
+                T_amb=T_amb,
+                length=length,
+                diameter=diameter,
+                U_value=U_value,
+            ),
+            where=on,
+        )
+
+        # estimated temperature drop in the distribution system
+        np.divide(
+            loss_heat_rate * (length_eff / length),
+            heat_capacity_rate,
+            out=dT_drop,
+            where=on,
+        )
+
+        # Heat loss in Wh during the timestep [h]
+        np.copyto(
+            heat_loss,
+            loss_heat_rate * self.timestep * flow_on,
+            where=on,
+        )
+        np.copyto(flow_on_timestep_fraction, flow_on, where=on)
+
+        return loss_heat_rate, heat_loss, dT_drop, flow_on_timestep_fraction
+
     @staticmethod
     def _pipe_loss_rate(
         T_avg=333.15,
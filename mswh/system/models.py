@@ -280,8 +280,9 @@ class System(object):
                 timestep averaging.
         """
 
-        # initiate a dataframe with hourly results
-        ts_res = pd.DataFrame(index=range(0, self.num_timesteps + 1))
+        # collect hourly result columns, the dataframe gets
+        # created once all columns are calculated
+        ts_res = dict()
 
         # components
         converters = Converter(
@@ -339,6 +340,33 @@ class System(object):
         T_upper_sol_tank[0] = self.t_main[0]
         T_lower_sol_tank[0] = self.t_main[0]
 
+        # storage results recorded in each timestep, with the result
+        # labels looked up once ahead of the loop
+        sto_outputs = (
+            # solar collector return temperature (from tank)
+            (T_coil_out, self.r['t_coil_out']),
+            # demand heat rate
+            (Q_dem, self.r['q_dem']),
+            (Q_dem_with_dist_loss, self.r['q_dem_tot']),
+            (q_dem_balance, self.r['q_dem_balance']),
+            # solar tank heat sources
+            (Q_coil_sol_tank, self.r['q_del_sol']),
+            (Q_ovrcool_sol_tank, self.r['q_ovrcool_tank']),
+            # solar tank heat sinks
+            (Q_loss_lower_sol_tank, self.r['q_loss_low']),
+            (Q_loss_upper_sol_tank, self.r['q_loss_up']),
+            (Q_del_sol_tank, self.r['q_del_tank']),
+            (Q_unmet_sol_tank, self.r['q_unmet_tank']),
+            (Q_dump_sol_tank, self.r['q_dump']),
+            # tank temperatures and set temperature
+            (T_upper_sol_tank, self.r['t_tank_up']),
+            (T_lower_sol_tank, self.r['t_tank_low']),
+            (T_set, self.r['t_set']),
+            # distribution system
+            (dT_dist_loss, self.r['dt_dist']),
+            (Q_dist_loss, self.r['q_dist_loss']),
+            (Q_pump_on_fraction, self.r['flow_on_frac']))
+
         # simulate main system
         for ts in range(self.num_timesteps):
 
@@ -359,34 +387,8 @@ class System(object):
                 pre_Q_in=Q_sol_col[ts],
                 max_V_tap=self.load_max)
 
-            # solar collector return temperature (from tank)
-            T_coil_out[ts + 1] = sto_res[self.r['t_coil_out']]
-
-            # demand heat rate
-            Q_dem[ts + 1] = sto_res[self.r['q_dem']]
-            Q_dem_with_dist_loss[ts + 1] = sto_res[self.r['q_dem_tot']]
-            q_dem_balance[ts + 1] = sto_res[self.r['q_dem_balance']]
-
-            # solar tank heat sources
-            Q_coil_sol_tank[ts + 1] = sto_res[self.r['q_del_sol']]
-            Q_ovrcool_sol_tank[ts + 1] = sto_res[self.r['q_ovrcool_tank']]
-
-            # solar tank heat sinks
-            Q_loss_lower_sol_tank[ts + 1] = sto_res[self.r['q_loss_low']]
-            Q_loss_upper_sol_tank[ts + 1] = sto_res[self.r['q_loss_up']]
-            Q_del_sol_tank[ts + 1] = sto_res[self.r['q_del_tank']]
-            Q_unmet_sol_tank[ts + 1] = sto_res[self.r['q_unmet_tank']]
-            Q_dump_sol_tank[ts + 1] = sto_res[self.r['q_dump']]
-
-            # tank temperatures and set temperature
-            T_upper_sol_tank[ts + 1] = sto_res[self.r['t_tank_up']]
-            T_lower_sol_tank[ts + 1] = sto_res[self.r['t_tank_low']]
-            T_set[ts + 1] = sto_res[self.r['t_set']]
-
-            # distribution system
-            dT_dist_loss[ts + 1] = sto_res[self.r['dt_dist']]
-            Q_dist_loss[ts + 1] = sto_res[self.r['q_dist_loss']]
-            Q_pump_on_fraction[ts + 1] = sto_res[self.r['flow_on_frac']]
+            for out, label in sto_outputs:
+                out[ts + 1] = sto_res[label]
 
         # simulate backup heater and assign household level gas
         # consumption
@@ -456,6 +458,8 @@ class System(object):
         # store load
         ts_res[self.r['proj_load']] = np.append(0., self.load)
 
+        ts_res = pd.DataFrame(ts_res, index=range(0, self.num_timesteps + 1))
+
         # get average temperatures and total heat rates
         t_columns = [col for col in ts_res.columns if 'Temperature' in col]
         # all other columns contain timestep heat rate
@@ -660,8 +664,9 @@ class System(object):
                 as the lower between the water main and the ambient.
         """
 
-        # initiate a dataframe with hourly results
-        ts_res = pd.DataFrame(index=range(0, self.num_timesteps + 1))
+        # collect hourly result columns, the dataframe gets
+        # created once all columns are calculated
+        ts_res = dict()
 
         # components
         converters = Converter(
@@ -733,6 +738,26 @@ class System(object):
 
         T_limit = hp_tank.T_max
 
+        # storage results recorded in each timestep, with the result
+        # labels looked up once ahead of the loop
+        sto_outputs = (
+            # demand heat rate
+            (Q_dem, self.r['q_dem']),
+            (Q_dem_with_dist_loss, self.r['q_dem_tot']),
+            (q_dem_balance, self.r['q_dem_balance']),
+            # heat pump tank heat sources
+            (Q_hp, self.r['q_del_hp']),
+            (Q_ovrcool_hp_tank, self.r['q_ovrcool_tank']),
+            # heat pump tank heat sinks
+            (Q_loss_lower_hp_tank, self.r['q_loss_low']),
+            (Q_loss_upper_hp_tank, self.r['q_loss_up']),
+            (Q_del_hp_tank, self.r['q_del_tank']),
+            (Q_unmet_hp_tank, self.r['q_unmet_tank']),
+            (Q_dump_hp_tank, self.r['q_dump']),
+            # resulting temperatures in the heat pump tank
+            (T_upper_hp_tank, self.r['t_tank_up']),
+            (T_lower_hp_tank, self.r['t_tank_low']))
+
         for ts in range(self.num_timesteps):
 
             # Use upper tank temperature, since this will be tapped and has
@@ -791,25 +816,8 @@ class System(object):
                 pre_Q_in=Q_hp_cap,
                 max_V_tap=self.load_max)
 
-            # demand heat rate
-            Q_dem[ts + 1] = sto_res[self.r['q_dem']]
-            Q_dem_with_dist_loss[ts + 1] = sto_res[self.r['q_dem_tot']]
-            q_dem_balance[ts + 1] = sto_res[self.r['q_dem_balance']]
-
-            # heat pump tank heat sources
-            Q_hp[ts + 1] = sto_res[self.r['q_del_hp']]
-            Q_ovrcool_hp_tank[ts + 1] = sto_res[self.r['q_ovrcool_tank']]
-
-            # heat pump tank heat sinks
-            Q_loss_lower_hp_tank[ts + 1] = sto_res[self.r['q_loss_low']]
-            Q_loss_upper_hp_tank[ts + 1] = sto_res[self.r['q_loss_up']]
-            Q_del_hp_tank[ts + 1] = sto_res[self.r['q_del_tank']]
-            Q_unmet_hp_tank[ts + 1] = sto_res[self.r['q_unmet_tank']]
-            Q_dump_hp_tank[ts + 1] = sto_res[self.r['q_dump']]
-
-            # resulting temperatures in the heat pump tank
-            T_upper_hp_tank[ts + 1] = sto_res[self.r['t_tank_up']]
-            T_lower_hp_tank[ts + 1] = sto_res[self.r['t_tank_low']]
+            for out, label in sto_outputs:
+                out[ts + 1] = sto_res[label]
 
             # set ambient air and main water temperatures
             T_main[ts + 1] = self.t_main[ts]
@@ -866,6 +874,8 @@ class System(object):
         ts_res[self.r['t_amb']] = T_amb
         ts_res[self.r['t_wet_bulb']] = T_wet_bulb
 
+        ts_res = pd.DataFrame(ts_res, index=range(0, self.num_timesteps + 1))
+
         # get average temperatures and total heat rates
         t_columns = [col for col in ts_res.columns if 'Temperature' in col]
         # all other columns contain timestep heat rate
@@ -13,6 +13,13 @@ from mswh.tools.unit_converters import UnitConv
 
 log = logging.getLogger(__name__)
 
+# gallon to cubic meter conversion factor
+_GAL_TO_M3 = UnitConv(1.0).m3_gal(unit_in="gal")
+
+# CSI-Thermal Program Handbook demand estimates in gal/day,
+# indexed by the number of household occupants
+_DEMAND_GAL_PER_DAY = np.array([15.0, 20.0, 35.0, 45.0, 55.0, 65.0, 75.0])
+
 
 class SourceAndSink(object):
     """Generates timeseries that are inputs to the simulation
@@ -66,6 +73,19 @@ class SourceAndSink(object):
         else:
             self.random_state = random_state
 
+    @property
+    def data(self):
+        return self.__data
+
+    @data.setter
+    def data(self, value):
+        """Clears the irradiation results computed from any
+        previously assigned input data. Input data modified in
+        place need to get assigned again to clear the results.
+        """
+        self.__data = value
+        self._irradiation_cache = dict()
+
     def irradiation_and_water_main(
         self,
         climate_zone,
@@ -163,6 +183,12 @@ class SourceAndSink(object):
                   'global_tilt_radiation_Wm2', 'water_main_t_F',
                   'water_main_t_C', 'dry_bulb_C', 'wet_bulb_C', 'Tilt',
                   'Azimuth']
+                  If no standard deviations are passed and
+                  single_row_with_arrays is False, the result is
+                  computed once per set of arguments and a copy is
+                  returned on any further call. Input data modified
+                  in place need to get assigned to `data` again to
+                  clear the computed results.
 
         Notes:
 
@@ -215,6 +241,28 @@ class SourceAndSink(object):
             log.error(msg)
             raise ValueError
 
+        # results without any random draws of the collector orientation
+        # only depend on the arguments, so they get computed once. Results
+        # packed into arrays are not cached, since a copy of the frame
+        # would share the arrays with the cached frame
+        cache_key = None
+        if not (
+            azimuth_standard_deviation
+            or tilt_standard_deviation
+            or single_row_with_arrays
+        ):
+            cache_key = (
+                climate_zone,
+                collector_tilt,
+                collector_azimuth,
+                location_ground_reflectance,
+                solar_constant_Wm2,
+                method,
+                weather_data_source,
+            )
+            if cache_key in self._irradiation_cache:
+                return self._irradiation_cache[cache_key].copy()
+
         # draw azimuth value from a distribution if standard
         # deviation provided
         if azimuth_standard_deviation:
@@ -441,8 +489,14 @@ class SourceAndSink(object):
 
         # REMEMBER: longitudes are in degrees West, meaning they should
         # both be positive here for California!
-        minutes_to_add = (4.0 * ((15.0 * 8.0) - longitude)) + E_minutes
-        solar_time = solar_data.hour + minutes_to_add / 60.0  # in hours
+        # evaluated on the raw arrays, in the same order as the
+        # equation such that the results are unchanged
+        minutes_to_add = (
+            4.0 * ((15.0 * 8.0) - longitude)
+        ) + E_minutes.to_numpy(dtype=float)
+        solar_time = (
+            solar_data.hour.to_numpy(dtype=float) + minutes_to_add / 60.0
+        )  # in hours
 
         # Calculate the hour angle
         # hour_angle = 15 degrees per hour away from solar noon (12),
@@ -728,6 +782,9 @@ class SourceAndSink(object):
         if single_row_with_arrays:
             data = self._pack_timeseries(data)
 
+        if cache_key is not None:
+            self._irradiation_cache[cache_key] = data.copy()
+
         return data
 
     @staticmethod
@@ -770,7 +827,7 @@ class SourceAndSink(object):
         """Converts a dataframe of timeseries data
         with timestep values in each row to
         a dataframe with a single row such that the timeseries
-        are packed as a list into each cell in that single row.
+        are packed as an array into each cell in that single row.
 
         Parameters:
 
@@ -786,13 +843,13 @@ class SourceAndSink(object):
         Returns:
 
             single_row_df: pd df
-                Timeseries data packed as a list in each cell of
+                Timeseries data packed as an array in each cell of
                 a single df row
         """
         single_row_df = pd.DataFrame(columns=df.columns, index=[row_index])
 
         for col in df.columns:
-            single_row_df[col] = [df[col]]
+            single_row_df[col] = [df[col].to_numpy()]
 
         return single_row_df
 
@@ -832,6 +889,7 @@ class SourceAndSink(object):
         random_state,
         occupancy=[4.0, 4.0, 4.0, 4.0],
         at_home=["n", "n", "n", "n"],
+        load_dtype=np.float64,
     ):
         """Creates example end-use load profile inputs using the example
         load database (sample of 128 households).
@@ -844,7 +902,8 @@ class SourceAndSink(object):
             labels: dist
                 Consumer label map
 
-            random_state: np.RandomState object
+            random_state: np.random.RandomState or
+                np.random.Generator object
 
             occupancy: list
                 List of household occupancies. Any occupancy
@@ -856,6 +915,13 @@ class SourceAndSink(object):
             at_home: list
                 List of at home during the day info, 'y' or 'n'
 
+            load_dtype: numpy dtype
+                Default: np.float64
+                Data type of the stored load arrays. np.float32
+                halves the memory of the load column, but the
+                system model results will no longer exactly match
+                those obtained with the default
+
         Returns:
 
             loading_input : df
@@ -866,139 +932,212 @@ class SourceAndSink(object):
                 Contains load id and maximum load in [gal] for
                 sizing purposes.
         """
-        # reformat the example end-use loads table
-        loads_df = inputs[labels["exmp_loads"]].copy()
-        # drop hour column
-        loads_df = loads_df.drop(labels["hour"], axis=1)
-        # convert loads into gallons
-        loads_df_m3 = loads_df.apply(
-            lambda x: UnitConv(x).m3_gal(unit_in="gal")
+        # column labels
+        id_col = labels["id"]
+        ld_id_col = labels["ld_id"]
+        occ_col = labels["occ"]
+        at_hm_col = labels["at_hm"]
+        load_col = labels["load_m3"]
+        max_load_col = labels["max_load"]
+
+        # example end-use loads table without the hour column,
+        # with a column of hourly loads in gallons per household
+        loads_gal = (
+            inputs[labels["exmp_loads"]]
+            .drop(labels["hour"], axis=1)
+            .to_numpy()
         )
-        single_row_loads = SourceAndSink._pack_timeseries(
-            loads_df_m3, row_index=labels["load_m3"]
+
+        # example households with their load ids, occupancy and at home
+        # info, in the order of the example loads table columns
+        example_cons = (
+            inputs[labels["exmp_consload"]]
+            .loc[:, [ld_id_col, occ_col, at_hm_col]]
+            .reset_index(drop=True)
         )
-        example_cons = single_row_loads.transpose().reset_index()
-        example_cons[labels["ld_id"]] = inputs[labels["exmp_consload"]].loc[
-            :, labels["ld_id"]
-        ]
-        example_cons[labels["occ"]] = inputs[labels["exmp_consload"]].loc[
-            :, labels["occ"]
-        ]
-        example_cons[labels["at_hm"]] = inputs[labels["exmp_consload"]].loc[
-            :, labels["at_hm"]
-        ]
-        example_cons[labels["max_load"]] = loads_df.max(axis=0).values
+        # load array in m3 for each household, taken as a row of the
+        # transposed loads table
+        example_cons[load_col] = list(
+            np.multiply(loads_gal.T, _GAL_TO_M3, order="C").astype(
+                load_dtype, copy=False
+            )
+        )
+        # peak loads in gallons for sizing, skipping any missing
+        # hourly values
+        example_cons[max_load_col] = np.nanmax(loads_gal, axis=0)
 
-        example_cons = example_cons.drop(columns="index", axis=1)
+        occ_arr = np.asarray(occupancy, dtype=np.float64)
 
-        if len(occupancy) != len(at_home):
-            msg = "Occupancy and at home arrays should have the same length."
-            log.error(msg)
-            raise Exception
-
-        if (np.array(occupancy) > 6).any():
-            occ_arr = np.array(occupancy)
-            max_occ = occ_arr.max()
-            occ_arr[occ_arr > 6] = 6.0
-            occupancy = list(occ_arr)
+        if (occ_arr > 6.0).any():
             msg = (
                 "Any occupancy above 6 is considered as occupancy of 6."
                 " Maximum provided is {}. Consider aggregating loads if this is"
                 " of concern."
             )
-            log.warning(msg.format(max_occ))
+            log.warning(msg.format(occ_arr.max()))
+
+        occupancy = np.minimum(occ_arr, 6.0)
+
+        # row positions of the example households for each
+        # (occupancy, at home) combination, grouped in a single
+        # pass instead of masking the table for each household
+        groups = example_cons.groupby([occ_col, at_hm_col], sort=False).indices
+
+        SourceAndSink._validate_inputs(occupancy, at_home, groups)
+
+        # row positions and the number of unique load ids to pick
+        # from for each combination
+        ld_ids = example_cons[ld_id_col].values
+
+        by_key = dict()
+        for key, positions in groups.items():
+            by_key[key] = (positions, len(np.unique(ld_ids[positions])))
 
-        uniq_occupancy = set(occupancy)
+        # row positions of the drawn households, in the order of
+        # the occupancy list. For example, first number in the
+        # occupancy list corresponds the first row in the
+        # loading_input dataframe.
+        selected_positions = SourceAndSink._draw_households(
+            zip(occupancy, at_home), by_key, random_state
+        )
+
+        loading_input = example_cons.iloc[selected_positions].reset_index(
+            drop=True
+        )
 
-        uniq_at_home = set(at_home)
+        loading_input[id_col] = range(1, loading_input.shape[0] + 1)
 
-        available_example_cons = example_cons.loc[
-            (example_cons[labels["occ"]].isin(uniq_occupancy))
-            & (example_cons[labels["at_hm"]].isin(uniq_at_home))
+        columns_expected_by_system_model = [
+            id_col,
+            occ_col,
+            load_col,
         ]
 
-        if available_example_cons.shape[0] == 0:
-            msg = (
-                "We don't have any households matching your inputs in"
-                " the database."
-            )
-            log.error(msg.format)
-            raise Exception
+        info_columns = [id_col, ld_id_col, max_load_col]
 
-        selected_load_ids = []
+        household_info = loading_input.loc[:, info_columns]
+        loading_input = loading_input.loc[:, columns_expected_by_system_model]
 
-        for cons in range(len(occupancy)):
+        return loading_input, household_info
 
-            occ = occupancy[cons]
-            at_hm = at_home[cons]
+    @staticmethod
+    def _validate_inputs(occupancy, at_home, groups):
+        """Checks the household inputs for the example load
+        profiles before any household gets drawn.
 
-            pick_from = available_example_cons.loc[
-                (example_cons[labels["occ"]].isin([occ]))
-                & (example_cons[labels["at_hm"]].isin([at_hm]))
-            ]
+        Parameters:
 
-            load_id = random_state.choice(
-                pick_from[labels["ld_id"]].values, 1
-            )[0]
+            occupancy: array
+                Household occupancies
 
-            while (load_id in selected_load_ids) and (
-                len(selected_load_ids)
-                < len(pick_from[labels["ld_id"]].unique())
-            ):
+            at_home: list
+                At home during the day info for each household
 
-                load_id = random_state.choice(
-                    pick_from[labels["ld_id"]].values, 1
-                )[0]
+            groups: dict
+                Row positions of the example households for each
+                (occupancy, at home) combination
+        """
+        if len(occupancy) != len(at_home):
+            msg = "Occupancy and at home arrays should have the same length."
+            log.error(msg)
+            raise ValueError
 
-            selected_load_ids.append(load_id)
+        # unique requested combinations, in the order requested
+        for occ, at_hm in dict.fromkeys(zip(occupancy, at_home)):
+            if (occ, at_hm) not in groups:
+                msg = (
+                    "We don't have any households matching occupancy {}"
+                    " and at home '{}' in the database."
+                )
+                log.error(msg.format(occ, at_hm))
+                raise ValueError
 
-            load_row = pick_from.loc[
-                pick_from[labels["ld_id"]] == load_id, :
-            ].reset_index()
+    @staticmethod
+    def _draw_households(keys, pools, random_state):
+        """Draws an example household for each household from
+        the pool of example households matching its occupancy
+        and at home info. Load ids are unique in the example
+        loads table, so each row position stands for a load id.
+
+        With a np.random.Generator, the households for all
+        requests sharing a key are drawn at once without
+        replacement, and with replacement only for the requests
+        exceeding the number of unique ids in the pool.
+
+        With a legacy np.random.RandomState, households are drawn
+        one at a time. A household already drawn is redrawn until
+        a new one comes up, as long as fewer households have
+        been drawn than there are unique ids in the pool.
 
-        # identify indexes drawn. Note that the Load ID is
-        # the same value as the index
+        Parameters:
 
-        indxs = available_example_cons.loc[
-            available_example_cons[labels["ld_id"]].isin(selected_load_ids)
-        ].index
+            keys: iterable of tuples
+                (occupancy, at home) for each household
 
-        loading_input = available_example_cons.loc[indxs, :].reset_index()
-        loading_input[labels["load_m3"]] = loading_input[
-            labels["load_m3"]
-        ].apply(lambda x: x.values)
+            pools: dict
+                For each (occupancy, at home) key, a tuple of
+                the array of row positions to pick from and the
+                number of unique load ids among them
 
-        loading_input = loading_input.drop(columns="index", axis=1)
+            random_state: np.random.RandomState or
+                np.random.Generator object
 
-        # sort by drawn loads to have the the loading_inputs dataframe
-        # rows be in order of the occupancy list. For example, first
-        # number in the occupancy list corresponds the first row
-        # in the loading_input dataframe.
+        Returns:
 
-        loading_input["Load ID"] = pd.CategoricalIndex(
-            loading_input[labels["ld_id"]],
-            ordered=True,
-            categories=selected_load_ids,
-        )
+            selected_positions: list
+                Row positions of the drawn example households,
+                in the order of the keys
+        """
+        if isinstance(random_state, np.random.Generator):
+            # positions of the households requesting each key
+            requests = dict()
+            for position, key in enumerate(keys):
+                requests.setdefault(key, []).append(position)
+
+            selected_positions = [None] * sum(map(len, requests.values()))
+
+            for key, positions in requests.items():
+                pool, pool_size = pools[key]
+
+                n_unique = min(len(positions), pool_size)
+                rows = random_state.choice(pool, size=n_unique, replace=False)
+
+                if len(positions) > n_unique:
+                    rows = np.concatenate(
+                        [
+                            rows,
+                            random_state.choice(
+                                pool, size=len(positions) - n_unique
+                            ),
+                        ]
+                    )
 
-        loading_input = loading_input.sort_values(
-            labels["ld_id"]
-        ).reset_index()
+                for position, row in zip(positions, rows):
+                    selected_positions[position] = row
 
-        loading_input[labels["id"]] = range(1, loading_input.shape[0] + 1)
+            return selected_positions
 
-        columns_expected_by_system_model = [
-            labels["id"],
-            labels["occ"],
-            labels["load_m3"],
-        ]
+        selected_positions = []
+        # set of the drawn rows for constant time membership checks
+        drawn = set()
 
-        info_columns = [labels["id"], labels["ld_id"], labels["max_load"]]
+        # households are drawn one at a time and in the order
+        # of the keys such that a given random state
+        # always reproduces the same load profiles
+        for key in keys:
 
-        household_info = loading_input.loc[:, info_columns]
-        loading_input = loading_input.loc[:, columns_expected_by_system_model]
+            pool, pool_size = pools[key]
 
-        return loading_input, household_info
+            row = random_state.choice(pool, 1)[0]
+
+            while (row in drawn) and (len(selected_positions) < pool_size):
+
+                row = random_state.choice(pool, 1)[0]
+
+            selected_positions.append(row)
+            drawn.add(row)
+
+        return selected_positions
 
     @staticmethod
     def demand_estimate(occ):
@@ -1008,12 +1147,30 @@ class SourceAndSink(object):
 
         Parameters:
 
-            occ: float
+            occ: float or array-like
                 Number of individual household occupants
+
+        Returns:
+
+            demand: float or array
+                Estimated demand in gal/day, with a shape
+                matching the input
         """
-        if occ == 1:
-            return 20.0
-        if occ == 2:
-            return 35.0
-        else:
-            return 35.0 + 10.0 * (occ - 2.0)
+        occ_arr = np.asarray(occ, dtype=np.float64)
+
+        # typical integer occupancies are read from the lookup table,
+        # others use the 35 gal/day for two occupants and an
+        # additional 10 gal/day for each occupant above two
+        in_table = np.isin(occ_arr, np.arange(_DEMAND_GAL_PER_DAY.size))
+        table_index = np.where(in_table, occ_arr, 0.0).astype(np.intp)
+
+        demand = np.where(
+            in_table,
+            _DEMAND_GAL_PER_DAY[table_index],
+            35.0 + 10.0 * (occ_arr - 2.0),
+        )
+
+        if np.ndim(occ) == 0:
+            return float(demand)
+
+        return demand
@@ -1,7 +1,12 @@
 import datetime
+import functools
+import glob
+import hashlib
 import logging
 import os
 import pickle
+import sys
+import tempfile
 import unittest
 
 
@@ -13,16 +18,332 @@ from mswh.system.source_and_sink import SourceAndSink
 from mswh.system.models import System
 from mswh.system.source_and_sink import SourceAndSink
 
-from mswh.tools.unit_converters import UnitConv, Utility
+from mswh.tools.unit_converters import Utility, M3_PER_GAL, M_PER_FT
 from mswh.comm.sql import Sql
 
 from mswh.comm.label_map import SwhLabels
-from mswh.tools.plots import Plot
+import mswh
 
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 
+_S = SwhLabels().set_prod_labels()
+
+# discrete pipe diameters, m
+_DISCR_DIAM_M = [
+    0.0127,
+    0.01905,
+    0.0254,
+    0.03175,
+    0.0381,
+    0.0508,
+    0.0635,
+    0.0762,
+    0.1016,
+]
+
+# save plot images only if requested, with MSWH_PLOT=1
+_PLOT = os.environ.get("MSWH_PLOT") == "1"
+
+
+def _plot(**kwargs):
+    """Imports the plotting tools only once a plot is
+    requested, since plotting is off by default.
+    """
+    from mswh.tools.plots import Plot
+
+    return Plot(**kwargs)
+
+
+def _ts_columns(ts_res, first, last, columns):
+    """Selects timeseries result columns for the timesteps
+    first through last, inclusive, by position.
+    """
+    return ts_res.iloc[first : last + 1, ts_res.columns.get_indexer(columns)]
+
+
+# assuming tests are run from the MSWH directory
+_INPUTS_DB_PATH = os.path.join(os.getcwd(), "mswh/comm/mswh_system_input.db")
+
+# project local directory for the cached results, see _cached
+_CACHE_DIR = os.path.join(os.getcwd(), ".pytest_cache", "mswh")
+
+# files whose changes invalidate the cached results: the input
+# database and every module of the package
+_CACHE_SOURCES = [_INPUTS_DB_PATH] + sorted(
+    glob.glob(
+        os.path.join(os.path.dirname(mswh.__file__), "**", "*.py"),
+        recursive=True,
+    )
+)
+
+# library versions whose changes invalidate the cached results
+_CACHE_VERSIONS = [sys.version, np.__version__, pd.__version__]
+
+
+@functools.lru_cache(maxsize=None)
+def _inputs():
+    """Reads all input tables from the database once per
+    test session.
+    """
+    db = Sql(_INPUTS_DB_PATH)
+
+    try:
+        inputs = db.tables2dict(close=True)
+    except:
+        msg = "Failed to read inputs from {}."
+        log.error(msg.format(_INPUTS_DB_PATH))
+
+    return inputs
+
+
+def _cached(key, fn, *args):
+    """Returns the result of fn(*args), pickled to the project
+    local .pytest_cache/mswh directory such that repeated test
+    runs can reuse it.
+
+    Parameters:
+
+        key: str
+            Name of the cached result
+
+        fn: callable
+            Computes the result if not cached yet
+
+        args: any picklable object
+            Arguments passed to fn
+
+    Returns:
+
+        result: any picklable object
+            Result of fn
+
+    Note: The cache file name includes a hash of the key, the
+    arguments, the python, numpy and pandas versions and the size
+    and modification time of the input database and of all package
+    modules, so any change to those recomputes the result. A cached
+    result that fails to load is removed and recomputed.
+    """
+    version = [key, args, _CACHE_VERSIONS]
+
+    for path in _CACHE_SOURCES:
+        stat = os.stat(path)
+        version.append((path, stat.st_size, stat.st_mtime_ns))
+
+    # hash the pickled arguments, since the repr of
+    # pandas objects is truncated
+    digest = hashlib.blake2b(
+        pickle.dumps(version, protocol=5), digest_size=16
+    ).hexdigest()
+
+    path = os.path.join(_CACHE_DIR, "{}_{}.pkl".format(key, digest))
+
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            msg = "Failed to load the cached result {}, recomputing it."
+            log.warning(msg.format(path))
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    result = fn(*args)
+
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+
+    # write to a temporary file first, such that tests running
+    # in parallel processes never load a partially written result
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(result, f, protocol=5)
+
+    os.replace(tmp_path, path)
+
+    return result
+
+
+def _weather_03():
+    """Irradiation and water main timeseries for the SF
+    climate (03, 16 is cold).
+    """
+    return SourceAndSink(input_dfs=_inputs()).irradiation_and_water_main(
+        "03", method="isotropic diffuse"
+    )
+
+
+def _example_loads(occ_com, at_home_com, occ_ind, at_home_ind):
+    """Draws the community and the individual example loads,
+    in this order, from a single random state.
+    """
+    random_state = np.random.RandomState(123)
+
+    com = SourceAndSink._make_example_loading_inputs(
+        _inputs(),
+        SwhLabels().set_hous_labels(),
+        random_state,
+        occupancy=occ_com,
+        at_home=at_home_com,
+    )
+
+    indiv = SourceAndSink._make_example_loading_inputs(
+        _inputs(),
+        SwhLabels().set_hous_labels(),
+        random_state,
+        occupancy=occ_ind,
+        at_home=at_home_ind,
+    )
+
+    return com, indiv
+
+
+def _run_model(model, system_kwargs, model_kwargs):
+    """Instantiates a System and runs one of its models."""
+    return getattr(System(**system_kwargs), model)(**model_kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _sol_the_sys_params():
+    """Solar thermal system performance parameters."""
+    return pd.DataFrame.from_records(
+        [
+            [_S["the_sto"], _S["f_upper_vol"], 0.5],
+            [_S["the_sto"], _S["ins_thi"], 0.085],
+            [_S["the_sto"], _S["spec_hea_con"], 0.04],
+            [_S["the_sto"], _S["t_tap_set"], 322.04],
+            [_S["the_sto"], _S["h_vs_r"], 6.0],
+            [_S["the_sto"], _S["dt_appr"], 2.0],
+            [_S["the_sto"], _S["t_max_tank"], 344.15],
+            [_S["the_sto"], _S["eta_coil"], 0.84],
+            [_S["the_sto"], _S["circ"], 0.0],
+            [_S["sol_col"], _S["interc_hwb"], 0.753],
+            [_S["sol_col"], _S["slope_hwb"], -4.025],
+            [_S["sol_pump"], _S["eta_sol_pump"], 0.85],
+            [_S["piping"], _S["pipe_spec_hea_con"], 0.0175],
+            [_S["piping"], _S["pipe_ins_thick"], 0.008],
+            [_S["piping"], _S["flow_factor"], 0.8],
+            [_S["piping"], _S["dia_len_exp"], 0.43082708345352605],
+            [
+                _S["piping"],
+                _S["dia_len_sca"],
+                0.007911283766743384,
+            ],
+            [_S["piping"], _S["discr_diam_m"], _DISCR_DIAM_M],
+            [_S["piping"], _S["circ"], False],
+            [_S["piping"], _S["long_br_len_fr"], 1.0],
+            [_S["dist_pump"], _S["eta_dist_pump"], 0.85],
+        ],
+        columns=[_S["comp"], _S["param"], _S["param_value"]],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _gas_tank_wh_params():
+    """Conventional gas tank water heater parameters,
+    ~R2.1, EL 1 from the rulemaking analysis.
+    """
+    return pd.DataFrame.from_records(
+        [
+            [_S["gas_tank"], _S["tank_re"], 0.78],
+            [_S["gas_tank"], _S["ins_thi"], 0.03],
+            [_S["gas_tank"], _S["spec_hea_con"], 0.081],
+            [_S["gas_tank"], _S["t_tap_set"], 322.04],
+        ],
+        columns=[_S["comp"], _S["param"], _S["param_value"]],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _sol_the_inst_gas_bckp_params():
+    """Gas tankless backup parameters."""
+    return pd.DataFrame.from_records(
+        [[_S["gas_burn"], _S["comb_eff"], 0.85]],
+        columns=[_S["comp"], _S["param"], _S["param_value"]],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _gas_tank_wh_params_val():
+    """Validation gas tank water heater parameters, with a
+    slightly higher RE and insulation set to R12, as used for
+    the solar tank.
+    """
+    return pd.DataFrame.from_records(
+        [
+            [_S["gas_tank"], _S["tank_re"], 0.82, "-"],
+            [_S["gas_tank"], _S["ins_thi"], 0.04, "m"],
+            [_S["gas_tank"], _S["spec_hea_con"], 0.085, "W/mK"],
+            [_S["gas_tank"], _S["t_tap_set"], 322.04, "K"],
+        ],
+        columns=[
+            _S["comp"],
+            _S["param"],
+            _S["param_value"],
+            _S["param_unit"],
+        ],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _sol_el_tank_params():
+    """Solar electric system performance parameters."""
+    return pd.DataFrame.from_records(
+        [
+            [_S["hp"], _S["c1_cop"], 1.229e00],
+            [_S["hp"], _S["c2_cop"], 5.549e-02],
+            [_S["hp"], _S["c3_cop"], 1.139e-04],
+            [_S["hp"], _S["c4_cop"], -1.128e-02],
+            [_S["hp"], _S["c5_cop"], -3.570e-06],
+            [_S["hp"], _S["c6_cop"], -7.234e-04],
+            [_S["hp"], _S["c1_heat_cap"], 7.055e-01],
+            [_S["hp"], _S["c2_heat_cap"], 3.945e-02],
+            [_S["hp"], _S["c3_heat_cap"], 1.433e-04],
+            [_S["hp"], _S["c4_heat_cap"], 2.768e-03],
+            [_S["hp"], _S["c5_heat_cap"], -1.069e-04],
+            [_S["hp"], _S["c6_heat_cap"], -2.494e-04],
+            [_S["hp"], _S["heat_cap_rated"], 2350.0],
+            [_S["hp"], _S["cop_rated"], 2.43],
+            [_S["pv"], _S["eta_pv"], 0.16],
+            [_S["pv"], _S["f_act"], 1.0],
+            [_S["pv"], _S["irrad_ref"], 1000.0],
+            [_S["inv"], _S["eta_dc_ac"], 0.85],
+            [_S["the_sto"], _S["f_upper_vol"], 0.5],
+            [_S["the_sto"], _S["ins_thi"], 0.04],
+            [_S["the_sto"], _S["spec_hea_con"], 0.04],
+            [_S["the_sto"], _S["t_tap_set"], 322.04],
+            [_S["the_sto"], _S["h_vs_r"], 6.0],
+            [_S["the_sto"], _S["dt_appr"], 2.0],
+            [_S["the_sto"], _S["t_max_tank"], 344.15],
+            [_S["piping"], _S["pipe_spec_hea_con"], 0.0175],
+            [_S["piping"], _S["pipe_ins_thick"], 0.008],
+            [_S["piping"], _S["flow_factor"], 0.8],
+            [_S["piping"], _S["dia_len_exp"], 0.43082708345352605],
+            [
+                _S["piping"],
+                _S["dia_len_sca"],
+                0.007911283766743384,
+            ],
+            [_S["piping"], _S["discr_diam_m"], _DISCR_DIAM_M],
+            [_S["piping"], _S["circ"], False],
+            [_S["piping"], _S["long_br_len_fr"], 1.0],
+        ],
+        columns=[_S["comp"], _S["param"], _S["param_value"]],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _sol_el_tank_inst_gas_bckp_params():
+    """Electric resistance backup parameters."""
+    return pd.DataFrame.from_records(
+        [[_S["el_res"], _S["eta_el_res"], 1.0]],
+        columns=[_S["comp"], _S["param"], _S["param_value"]],
+    )
+
 
 class SystemTests(unittest.TestCase):
     """Unit tests for the project level
@@ -32,38 +353,33 @@ class SystemTests(unittest.TestCase):
     @classmethod
     def setUpClass(self):
         """Assigns values to test variables."""
-        random_state = np.random.RandomState(123)
+        # Save plot images only if requested, with MSWH_PLOT=1,
+        # under img on the test directory
+        self.plot_results = _PLOT
+        self.outpath = os.path.join(os.path.dirname(__file__), "img")
 
-        self.plot_results = True
-        # it will save under img on the test directory
-        self.outpath = os.path.dirname(__file__)
+        if self.plot_results:
+            os.makedirs(self.outpath, exist_ok=True)
 
         # get labels
         self.c = SwhLabels().set_hous_labels()
         self.s = SwhLabels().set_prod_labels()
         self.r = SwhLabels().set_res_labels()
 
-        # generate weather data and annual hourly
-        # water draw profile
-
-        weather_db_path = os.path.join(
-            os.getcwd(), "mswh/comm/mswh_system_input.db"
-        )
+        # System keyword arguments by test system name, such
+        # that only the systems a test simulates get built,
+        # see _simulate
+        self._system_kwargs = dict()
 
-        db = Sql(weather_db_path)
+        # simulation results by test system name, model and
+        # model arguments, shared by the assertion and the
+        # plotting tests
+        self._results = dict()
 
-        try:
-            inputs = db.tables2dict(close=True)
-        except:
-            msg = "Failed to read inputs from {}."
-            log.error(msg.format(weather_db_path))
-
-        source_and_sink = SourceAndSink(input_dfs=inputs)
-
-        # SF climate is 03, 16 is cold
-        self.weather = source_and_sink.irradiation_and_water_main(
-            "03", method="isotropic diffuse"
-        )
+        # generate weather data and annual hourly
+        # water draw profile, reusing the results of
+        # previous test runs where possible
+        self.weather = _cached("weather_03", _weather_03)
 
         # community scale household occupancies for 4 households
         occ_com = [4, 4, 3, 5]
@@ -75,23 +391,16 @@ class SystemTests(unittest.TestCase):
         at_home_com = ["n", "n", "n", "n"]
         at_home_ind = ["n"]
 
-        loads_com, peakload_com = SourceAndSink._make_example_loading_inputs(
-            inputs,
-            self.c,
-            random_state,
-            occupancy=occ_com,
-            at_home=at_home_com,
-        )
-
         (
-            loads_indiv,
-            peakload_indiv,
-        ) = SourceAndSink._make_example_loading_inputs(
-            inputs,
-            self.c,
-            random_state,
-            occupancy=occ_ind,
-            at_home=at_home_ind,
+            (loads_com, peakload_com),
+            (loads_indiv, peakload_indiv),
+        ) = _cached(
+            "example_loads",
+            _example_loads,
+            occ_com,
+            at_home_com,
+            occ_ind,
+            at_home_ind,
         )
 
         # scaled loads to match 300 L/day
@@ -109,41 +418,7 @@ class SystemTests(unittest.TestCase):
         # performance parameters
 
         # solar thermal
-        sol_the_sys_params = pd.DataFrame(
-            data=[
-                [self.s["the_sto"], self.s["f_upper_vol"], 0.5],
-                [self.s["the_sto"], self.s["ins_thi"], 0.085],
-                [self.s["the_sto"], self.s["spec_hea_con"], 0.04],
-                [self.s["the_sto"], self.s["t_tap_set"], 322.04],
-                [self.s["the_sto"], self.s["h_vs_r"], 6.0],
-                [self.s["the_sto"], self.s["dt_appr"], 2.0],
-                [self.s["the_sto"], self.s["t_max_tank"], 344.15],
-                [self.s["the_sto"], self.s["eta_coil"], 0.84],
-                [self.s["the_sto"], self.s["circ"], 0.0],
-                [self.s["sol_col"], self.s["interc_hwb"], 0.753],
-                [self.s["sol_col"], self.s["slope_hwb"], -4.025],
-                [self.s["sol_pump"], self.s["eta_sol_pump"], 0.85],
-                [self.s["piping"], self.s["pipe_spec_hea_con"], 0.0175],
-                [self.s["piping"], self.s["pipe_ins_thick"], 0.008],
-                [self.s["piping"], self.s["flow_factor"], 0.8],
-                [self.s["piping"], self.s["dia_len_exp"], 0.43082708345352605],
-                [
-                    self.s["piping"],
-                    self.s["dia_len_sca"],
-                    0.007911283766743384,
-                ],
-                [
-                    self.s["piping"],
-                    self.s["discr_diam_m"],
-                    "[0.0127, 0.01905, 0.0254, 0.03175, 0.0381,"
-                    "0.0508, 0.0635, 0.0762, 0.1016]",
-                ],
-                [self.s["piping"], self.s["circ"], False],
-                [self.s["piping"], self.s["long_br_len_fr"], 1.0],
-                [self.s["dist_pump"], self.s["eta_dist_pump"], 0.85],
-            ],
-            columns=[self.s["comp"], self.s["param"], self.s["param_value"]],
-        )
+        sol_the_sys_params = _sol_the_sys_params()
 
         last_row_for_indiv = (
             sol_the_sys_params.shape[0]
@@ -153,32 +428,27 @@ class SystemTests(unittest.TestCase):
             ].shape[0]
         )
 
+        # individual systems have no distribution pump, which
+        # is listed last
+        sol_the_sys_params_indiv = sol_the_sys_params.iloc[
+            : last_row_for_indiv + 1
+        ]
+
         # conventional gas tank wh
         # ~R2.1, EL 1 from the rulemaking analysis
-        gas_tank_wh_params = pd.DataFrame(
-            data=[
-                [self.s["gas_tank"], self.s["tank_re"], 0.78],
-                [self.s["gas_tank"], self.s["ins_thi"], 0.03],
-                [self.s["gas_tank"], self.s["spec_hea_con"], 0.081],
-                [self.s["gas_tank"], self.s["t_tap_set"], 322.04],
-            ],
-            columns=[self.s["comp"], self.s["param"], self.s["param_value"]],
-        )
+        gas_tank_wh_params = _gas_tank_wh_params()
 
         # gas tankless backup
-        sol_the_inst_gas_bckp_params = pd.DataFrame(
-            data=[[self.s["gas_burn"], self.s["comb_eff"], 0.85]],
-            columns=[self.s["comp"], self.s["param"], self.s["param_value"]],
-        )
+        sol_the_inst_gas_bckp_params = _sol_the_inst_gas_bckp_params()
 
         # sizing
 
         # assume 4 occupants
         # basecase gas tank WH: DOE sizing rule based on
         # peak hourly demand +/-2 gal, assuming +/- 0
-        gas_tank_size_indiv = UnitConv(
-            peakload_indiv.loc[0, self.c["max_load"]]
-        ).m3_gal(unit_in="gal")
+        gas_tank_size_indiv = (
+            peakload_indiv.loc[0, self.c["max_load"]] * M3_PER_GAL
+        )
 
         gas_tank_wh_size = pd.DataFrame(
             data=[[self.s["gas_tank"], gas_tank_size_indiv]],
@@ -192,19 +462,11 @@ class SystemTests(unittest.TestCase):
         )
 
         # CSI sizing rules
-        def demand_estimate(occ):
-            if occ == 1:
-                return 20.0
-            if occ == 2:
-                return 35.0
-            else:
-                return 35.0 + 10.0 * (occ - 2.0)
-
-        peakload_com[self.c["dem_estimate"]] = loads_com[self.c["occ"]].apply(
-            lambda x: demand_estimate(x)
+        peakload_com[self.c["dem_estimate"]] = SourceAndSink.demand_estimate(
+            loads_com[self.c["occ"]].to_numpy()
         )
 
-        demand_estimate_ind = demand_estimate(occ_ind[0])
+        demand_estimate_ind = SourceAndSink.demand_estimate(occ_ind[0])
 
         demand_estimate_com = peakload_com[self.c["dem_estimate"]].sum()
 
@@ -217,11 +479,11 @@ class SystemTests(unittest.TestCase):
         tank_vol_ind_gal = col_area_ind_sqft * tank_vol_scaler
         tank_vol_com_gal = col_area_com_sqft * tank_vol_scaler
 
-        col_area_ind = UnitConv(col_area_ind_sqft).sqft_m2()
-        col_area_com = UnitConv(col_area_com_sqft).sqft_m2()
+        col_area_ind = col_area_ind_sqft * M_PER_FT**2
+        col_area_com = col_area_com_sqft * M_PER_FT**2
 
-        tank_vol_ind = UnitConv(tank_vol_ind_gal).m3_gal(unit_in="gal")
-        tank_vol_com = UnitConv(tank_vol_com_gal).m3_gal(unit_in="gal")
+        tank_vol_ind = tank_vol_ind_gal * M3_PER_GAL
+        tank_vol_com = tank_vol_com_gal * M3_PER_GAL
 
         # piping
         pipe_m_per_hhld = 3.048
@@ -266,60 +528,43 @@ class SystemTests(unittest.TestCase):
             columns=[self.s["comp"], self.s["cap"]],
         )
 
-        # gas tank backup
-        sol_the_gas_tank_bckp_params = gas_tank_wh_params.copy()
-
-        peakload_com["gas_tank_size_com"] = peakload_com[
-            self.c["max_load"]
-        ].apply(lambda x: UnitConv(x).m3_gal(unit_in="gal"))
-
-        peakload_com.index = peakload_com[self.c["id"]]
+        # gas tank backup, system models only read their parameters
+        sol_the_gas_tank_bckp_params = gas_tank_wh_params
 
-        sol_the_gas_tank_bckp_sizes_com = pd.DataFrame(
-            columns=[self.c["id"], self.s["comp"], self.s["cap"]],
-            index=peakload_com.index,
-        )
-
-        for i in peakload_com.index:
-            sol_the_gas_tank_bckp_sizes_com.loc[i, self.c["id"]] = i
-            sol_the_gas_tank_bckp_sizes_com.loc[i, self.s["comp"]] = self.s[
-                "gas_tank"
-            ]
-            sol_the_gas_tank_bckp_sizes_com.loc[
-                i, self.s["cap"]
-            ] = peakload_com.loc[i, "gas_tank_size_com"]
+        # household ids and sizes in the order of the peak loads
+        ids = peakload_com[self.c["id"]].to_numpy()
 
-        sol_the_gas_tank_bckp_sizes_com.index = range(
-            sol_the_gas_tank_bckp_sizes_com.shape[0]
+        gas_tank_size_com = (
+            peakload_com[self.c["max_load"]].to_numpy(dtype=float) * M3_PER_GAL
         )
 
-        sol_the_inst_gas_bckp_sizes_com = pd.DataFrame(
-            columns=[self.c["id"], self.s["comp"], self.s["cap"]],
-            index=peakload_com.index,
+        sol_the_gas_tank_bckp_sizes_com = pd.DataFrame(
+            {
+                self.c["id"]: ids,
+                self.s["comp"]: self.s["gas_tank"],
+                self.s["cap"]: gas_tank_size_com,
+            }
         )
 
         def gas_tankles_size_W(occupancy):
             size = 24875.0 * occupancy ** 0.5175
             return size
 
-        for i in peakload_com.index:
-            sol_the_inst_gas_bckp_sizes_com.loc[i, self.c["id"]] = i
-            sol_the_inst_gas_bckp_sizes_com.loc[i, self.s["comp"]] = self.s[
-                "gas_burn"
-            ]
-            sol_the_inst_gas_bckp_sizes_com.loc[
-                i, self.s["cap"]
-            ] = gas_tankles_size_W(occ_com[i - 1])
-
-        sol_the_inst_gas_bckp_sizes_com.index = range(
-            sol_the_inst_gas_bckp_sizes_com.shape[0]
+        sol_the_inst_gas_bckp_sizes_com = pd.DataFrame(
+            {
+                self.c["id"]: ids,
+                self.s["comp"]: self.s["gas_burn"],
+                self.s["cap"]: gas_tankles_size_W(
+                    np.asarray(occ_com, dtype=float)[ids - 1]
+                ),
+            }
         )
 
         # instantiate systems
 
         # individual system
-        self.sol_wh_indiv_new = System(
-            sys_params=sol_the_sys_params.loc[:last_row_for_indiv, :],
+        self._system_kwargs["sol_wh_indiv_new"] = dict(
+            sys_params=sol_the_sys_params_indiv,
             backup_params=sol_the_inst_gas_bckp_params,
             sys_sizes=sol_the_sys_sizes_indiv,
             backup_sizes=sol_the_inst_gas_bckp_size,
@@ -333,8 +578,8 @@ class SystemTests(unittest.TestCase):
         )
         log.info(msg)
 
-        self.sol_wh_indiv_retr = System(
-            sys_params=sol_the_sys_params.loc[:last_row_for_indiv, :],
+        self._system_kwargs["sol_wh_indiv_retr"] = dict(
+            sys_params=sol_the_sys_params_indiv,
             backup_params=sol_the_gas_tank_bckp_params,
             sys_sizes=sol_the_sys_sizes_indiv,
             backup_sizes=sol_the_gas_tank_bckp_size,
@@ -349,7 +594,7 @@ class SystemTests(unittest.TestCase):
         log.info(msg)
 
         # community system
-        self.sol_wh_com_new = System(
+        self._system_kwargs["sol_wh_com_new"] = dict(
             sys_params=sol_the_sys_params,
             backup_params=sol_the_inst_gas_bckp_params,
             sys_sizes=sol_the_sys_sizes_com,
@@ -364,7 +609,7 @@ class SystemTests(unittest.TestCase):
         )
         log.info(msg)
 
-        self.sol_wh_com_retr = System(
+        self._system_kwargs["sol_wh_com_retr"] = dict(
             sys_params=sol_the_sys_params,
             backup_params=sol_the_gas_tank_bckp_params,
             sys_sizes=sol_the_sys_sizes_com,
@@ -396,15 +641,15 @@ class SystemTests(unittest.TestCase):
         sol_the_sys_sizes_val = pd.DataFrame(
             data=[
                 [self.s["sol_col"], 3.9],
-                [self.s["the_sto"], UnitConv(80.0).m3_gal(unit_in="gal")],
+                [self.s["the_sto"], 80.0 * M3_PER_GAL],
                 [self.s["sol_pump"], indiv_solar_pump_size],
                 [self.s["piping"], 0.0],
             ],
             columns=[self.s["comp"], self.s["cap"]],
         )
 
-        self.val_sol_wh = System(
-            sys_params=sol_the_sys_params.loc[:last_row_for_indiv, :],
+        self._system_kwargs["val_sol_wh"] = dict(
+            sys_params=sol_the_sys_params_indiv,
             backup_params=sol_the_inst_gas_bckp_params,
             sys_sizes=sol_the_sys_sizes_val,
             backup_sizes=sol_the_inst_gas_bckp_size,
@@ -418,7 +663,7 @@ class SystemTests(unittest.TestCase):
         )
         log.info(msg)
 
-        self.conv_wh = System(
+        self._system_kwargs["conv_wh"] = dict(
             sys_params=gas_tank_wh_params,
             sys_sizes=gas_tank_wh_size,
             weather=self.weather,
@@ -430,23 +675,10 @@ class SystemTests(unittest.TestCase):
 
         # With baseline tank with a slightly higher RE and insulation set to
         # R12, as used for the solar tank
-        gas_tank_wh_params_val = pd.DataFrame(
-            data=[
-                [self.s["gas_tank"], self.s["tank_re"], 0.82, "-"],
-                [self.s["gas_tank"], self.s["ins_thi"], 0.04, "m"],
-                [self.s["gas_tank"], self.s["spec_hea_con"], 0.085, "W/mK"],
-                [self.s["gas_tank"], self.s["t_tap_set"], 322.04, "K"],
-            ],
-            columns=[
-                self.s["comp"],
-                self.s["param"],
-                self.s["param_value"],
-                self.s["param_unit"],
-            ],
-        )
+        gas_tank_wh_params_val = _gas_tank_wh_params_val()
 
         # with validation loads and validation parameters
-        self.conv_wh_val = System(
+        self._system_kwargs["conv_wh_val"] = dict(
             sys_params=gas_tank_wh_params_val,
             sys_sizes=gas_tank_wh_size,
             weather=self.weather,
@@ -459,60 +691,14 @@ class SystemTests(unittest.TestCase):
         # project level component parameter
         # dataframe for solar electric system
         # with an inst. gas backup
-        sol_el_tank_params = pd.DataFrame(
-            data=[
-                [self.s["hp"], self.s["c1_cop"], 1.229e00],
-                [self.s["hp"], self.s["c2_cop"], 5.549e-02],
-                [self.s["hp"], self.s["c3_cop"], 1.139e-04],
-                [self.s["hp"], self.s["c4_cop"], -1.128e-02],
-                [self.s["hp"], self.s["c5_cop"], -3.570e-06],
-                [self.s["hp"], self.s["c6_cop"], -7.234e-04],
-                [self.s["hp"], self.s["c1_heat_cap"], 7.055e-01],
-                [self.s["hp"], self.s["c2_heat_cap"], 3.945e-02],
-                [self.s["hp"], self.s["c3_heat_cap"], 1.433e-04],
-                [self.s["hp"], self.s["c4_heat_cap"], 2.768e-03],
-                [self.s["hp"], self.s["c5_heat_cap"], -1.069e-04],
-                [self.s["hp"], self.s["c6_heat_cap"], -2.494e-04],
-                [self.s["hp"], self.s["heat_cap_rated"], 2350.0],
-                [self.s["hp"], self.s["cop_rated"], 2.43],
-                [self.s["pv"], self.s["eta_pv"], 0.16],
-                [self.s["pv"], self.s["f_act"], 1.0],
-                [self.s["pv"], self.s["irrad_ref"], 1000.0],
-                [self.s["inv"], self.s["eta_dc_ac"], 0.85],
-                [self.s["the_sto"], self.s["f_upper_vol"], 0.5],
-                [self.s["the_sto"], self.s["ins_thi"], 0.04],
-                [self.s["the_sto"], self.s["spec_hea_con"], 0.04],
-                [self.s["the_sto"], self.s["t_tap_set"], 322.04],
-                [self.s["the_sto"], self.s["h_vs_r"], 6.0],
-                [self.s["the_sto"], self.s["dt_appr"], 2.0],
-                [self.s["the_sto"], self.s["t_max_tank"], 344.15],
-                [self.s["piping"], self.s["pipe_spec_hea_con"], 0.0175],
-                [self.s["piping"], self.s["pipe_ins_thick"], 0.008],
-                [self.s["piping"], self.s["flow_factor"], 0.8],
-                [self.s["piping"], self.s["dia_len_exp"], 0.43082708345352605],
-                [
-                    self.s["piping"],
-                    self.s["dia_len_sca"],
-                    0.007911283766743384,
-                ],
-                [
-                    self.s["piping"],
-                    self.s["discr_diam_m"],
-                    "[0.0127, 0.01905, 0.0254, 0.03175, 0.0381,"
-                    "0.0508, 0.0635, 0.0762, 0.1016]",
-                ],
-                [self.s["piping"], self.s["circ"], False],
-                [self.s["piping"], self.s["long_br_len_fr"], 1.0],
-            ],
-            columns=[self.s["comp"], self.s["param"], self.s["param_value"]],
-        )
+        sol_el_tank_params = _sol_el_tank_params()
 
         # test sizing
         sol_el_tank_sizes_indiv = pd.DataFrame(
             data=[
                 [self.s["hp"], 2350.0],
                 [self.s["pv"], 6.25],
-                [self.s["the_sto"], UnitConv(80).m3_gal()],
+                [self.s["the_sto"], 80.0 * M3_PER_GAL],
                 [self.s["dist_pump"], dist_pump_size],
                 [self.s["piping"], pipe_m_per_hhld],
             ],
@@ -520,10 +706,7 @@ class SystemTests(unittest.TestCase):
         )
 
         # electric resistance backup parameters
-        sol_el_tank_inst_gas_bckp_params = pd.DataFrame(
-            data=[[self.s["el_res"], self.s["eta_el_res"], 1.0]],
-            columns=[self.s["comp"], self.s["param"], self.s["param_value"]],
-        )
+        sol_el_tank_inst_gas_bckp_params = _sol_el_tank_inst_gas_bckp_params()
 
         # electric resistance backup size
         sol_el_tank_inst_el_res_bckp_size = pd.DataFrame(
@@ -531,7 +714,7 @@ class SystemTests(unittest.TestCase):
             columns=[self.c["id"], self.s["comp"], self.s["cap"]],
         )
 
-        self.hp_wh = System(
+        self._system_kwargs["hp_wh"] = dict(
             sys_params=sol_el_tank_params,
             backup_params=sol_el_tank_inst_gas_bckp_params,
             sys_sizes=sol_el_tank_sizes_indiv,
@@ -540,6 +723,83 @@ class SystemTests(unittest.TestCase):
             loads=loads_indiv,
         )
 
+    def _simulate(self, name, model, **kwargs):
+        """Simulates a test system once per test class, or
+        loads the results of a previous test run, and returns
+        the results.
+
+        Parameters:
+
+            name: str
+                Test system attribute name
+
+            model: str
+                System model method name, such as
+                solar_thermal or conventional_gas_tank
+
+            **kwargs:
+                Keyword arguments passed to the model
+
+        Returns:
+
+            results: tuple
+                Results of the System model
+        """
+        key = (name, model) + tuple(sorted(kwargs.items()))
+
+        if key not in self._results:
+            self._results[key] = _cached(
+                "{}_{}".format(name, model),
+                _run_model,
+                model,
+                self._system_kwargs[name],
+                kwargs,
+            )
+
+        return self._results[key]
+
+    def _solar_thermal(self, name, backup):
+        """Simulates a solar thermal test system once per
+        test class and returns the results.
+
+        Parameters:
+
+            name: str
+                Test system attribute name
+
+            backup: str
+                Backup type passed to System.solar_thermal
+
+        Returns:
+
+            results: tuple
+                Results of System.solar_thermal
+        """
+        return self._simulate(name, "solar_thermal", backup=backup)
+
+    def _assert_almost_equal_all(self, pairs, places=1):
+        """Checks that each result equals its expected value to
+        the given number of decimal places, as assertAlmostEqual,
+        reporting all mismatches at once.
+
+        Parameters:
+
+            pairs: list of tuples
+                (result, expected) pairs of floats
+
+            places: int
+                Number of decimal places
+        """
+        result, expected = np.array(pairs, dtype=float).T
+
+        np.testing.assert_allclose(
+            result,
+            expected,
+            rtol=0.0,
+            atol=0.5 * 10.0**-places,
+            equal_nan=False,
+        )
+
     def test_solar_thermal_individual_new(self):
         """Test solar thermal project level model with a
         tankless backup heater
@@ -559,125 +819,119 @@ class SystemTests(unittest.TestCase):
                 backup_ts_cons,
                 rel_err,
             ],
-        ) = self.sol_wh_indiv_new.solar_thermal(backup="gas")
+        ) = self._solar_thermal("sol_wh_indiv_new", "gas")
 
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_tank"]], 2451283.75, places=1
-        )
-
-        self.assertAlmostEqual(
-            proj_total[self.r["q_dump"]], 1370147.25, places=1
-        )
+        q_del_bckp = proj_total[self.r["q_del_bckp"]]
 
-        self.assertAlmostEqual(
-            proj_total[self.r["el_use"]], 54490.14, places=1
+        # (result, expected) pairs
+        self._assert_almost_equal_all(
+            [
+                (proj_total[self.r["q_del_tank"]], 2451283.75),
+                (proj_total[self.r["q_dump"]], 1370147.25),
+                (proj_total[self.r["el_use"]], 54490.14),
+                (q_del_bckp, cons_total.at[0, self.r["q_del_bckp"]]),
+                (q_del_bckp, 215101.34),
+                (sol_fra["annual"], cons_total.at[0, self.r["sol_fra"]]),
+                # Seasonal energy use
+                (
+                    cons_total[self.r["gas_use"]][0],
+                    cons_total[self.r["gas_use_s"]][0]
+                    + cons_total[self.r["gas_use_w"]][0],
+                ),
+                (
+                    cons_total[self.r["el_use"]][0],
+                    cons_total[self.r["el_use_s"]][0]
+                    + cons_total[self.r["el_use_w"]][0],
+                ),
+            ]
         )
 
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_bckp"]],
-            cons_total.at[0, self.r["q_del_bckp"]],
-            places=1,
-        )
+    @unittest.skipUnless(_PLOT, "Plots are saved only with MSWH_PLOT=1.")
+    def test_solar_thermal_individual_new_plot(self):
+        """Plots the timeseries results of the
+        individual new solar thermal system.
+        """
+        # timeseries results
+        ts_res = self._solar_thermal("sol_wh_indiv_new", "gas")[2][4]
 
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_bckp"]], 215101.34, places=1
+        _plot(
+            data_headers=["Demand", "Delivered", "Unmet", "Coil"],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Heat rate [W]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                5112,
+                5232,
+                [
+                    self.r["q_dem"],
+                    self.r["q_del_tank"],
+                    self.r["q_unmet_tank"],
+                    self.r["q_del_sol"],
+                ],
+            ),
+            outfile="sol_tank_ind_new_heatrate_defpars_4per_summer.png",
+            modes="lines",
         )
 
-        self.assertAlmostEqual(
-            sol_fra["annual"], cons_total.at[0, self.r["sol_fra"]], places=1
+        _plot(
+            data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Temperature [K]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                5112,
+                5232,
+                [self.r["t_tank_up"], self.r["t_tank_low"]],
+            ),
+            outfile="sol_tank_ind_new_temp_defpars_4per_summer.png",
+            modes="lines",
         )
 
-        # Seasonal energy use
-        self.assertAlmostEqual(
-            cons_total[self.r["gas_use"]][0],
-            (
-                cons_total[self.r["gas_use_s"]][0]
-                + cons_total[self.r["gas_use_w"]][0]
+        _plot(
+            data_headers=["Demand", "Delivered", "Unmet", "Coil"],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Heat rate [W]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                480,
+                600,
+                [
+                    self.r["q_dem"],
+                    self.r["q_del_tank"],
+                    self.r["q_unmet_tank"],
+                    self.r["q_del_sol"],
+                ],
             ),
-            places=1,
+            outfile="sol_tank_ind_new_heatrate_defpars_4per_winter.png",
+            modes="lines",
         )
 
-        self.assertAlmostEqual(
-            cons_total[self.r["el_use"]][0],
-            (
-                cons_total[self.r["el_use_s"]][0]
-                + cons_total[self.r["el_use_w"]][0]
+        _plot(
+            data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Temperature [K]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                480,
+                600,
+                [self.r["t_tank_up"], self.r["t_tank_low"]],
             ),
-            places=1,
+            outfile="sol_tank_ind_new_temp_defpars_4per_winter.png",
+            modes="lines",
         )
 
-        if self.plot_results:
-            Plot(
-                data_headers=["Demand", "Delivered", "Unmet", "Coil"],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Heat rate [W]",
-            ).series(
-                ts_res.loc[
-                    5112:5232,
-                    [
-                        self.r["q_dem"],
-                        self.r["q_del_tank"],
-                        self.r["q_unmet_tank"],
-                        self.r["q_del_sol"],
-                    ],
-                ],
-                outfile="img/"
-                "sol_tank_ind_new_heatrate_defpars_4per_summer.png",
-                modes="lines",
-            )
-
-            Plot(
-                data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Temperature [K]",
-            ).series(
-                ts_res.loc[
-                    5112:5232, [self.r["t_tank_up"], self.r["t_tank_low"]]
-                ],
-                outfile="img/" "sol_tank_ind_new_temp_defpars_4per_summer.png",
-                modes="lines",
-            )
-
-        if self.plot_results:
-            Plot(
-                data_headers=["Demand", "Delivered", "Unmet", "Coil"],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Heat rate [W]",
-            ).series(
-                ts_res.loc[
-                    480:600,
-                    [
-                        self.r["q_dem"],
-                        self.r["q_del_tank"],
-                        self.r["q_unmet_tank"],
-                        self.r["q_del_sol"],
-                    ],
-                ],
-                outfile="img/"
-                "sol_tank_ind_new_heatrate_defpars_4per_winter.png",
-                modes="lines",
-            )
-
-            Plot(
-                data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Temperature [K]",
-            ).series(
-                ts_res.loc[
-                    480:600, [self.r["t_tank_up"], self.r["t_tank_low"]]
-                ],
-                outfile="img/" "sol_tank_ind_new_temp_defpars_4per_winter.png",
-                modes="lines",
-            )
-
     def test_solar_thermal_community_new(self):
         """Test solar thermal project level model with a
         tankless backup heater
@@ -696,73 +950,72 @@ class SystemTests(unittest.TestCase):
                 backup_ts_cons,
                 rel_err,
             ],
-        ) = self.sol_wh_com_new.solar_thermal(backup="gas")
-
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_bckp"]],
-            cons_total[self.r["q_del_bckp"]].sum(),
-            places=1,
-        )
-
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_bckp"]],
-            cons_total[self.r["q_del_bckp"]].sum(),
-            places=1,
-        )
+        ) = self._solar_thermal("sol_wh_com_new", "gas")
 
-        self.assertAlmostEqual(
-            proj_total[self.r["el_use"]], 138084.38, places=1
+        # (result, expected) pairs
+        self._assert_almost_equal_all(
+            [
+                (
+                    proj_total[self.r["q_del_bckp"]],
+                    cons_total[self.r["q_del_bckp"]].sum(),
+                ),
+                (proj_total[self.r["el_use"]], 138084.38),
+                (proj_total[self.r["q_del_tank"]], 10475486.74),
+                (
+                    ts_res[self.r["q_dump"]].sum(),
+                    proj_total[self.r["q_dump"]],
+                ),
+                (sol_fra["annual"], cons_total.at[1, self.r["sol_fra"]]),
+            ]
         )
 
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_tank"]], 10475486.74, places=1
-        )
+    @unittest.skipUnless(_PLOT, "Plots are saved only with MSWH_PLOT=1.")
+    def test_solar_thermal_community_new_plot(self):
+        """Plots the timeseries results of the
+        community new solar thermal system.
+        """
+        # timeseries results
+        ts_res = self._solar_thermal("sol_wh_com_new", "gas")[2][4]
 
-        self.assertAlmostEqual(
-            ts_res[self.r["q_dump"]].sum(),
-            proj_total[self.r["q_dump"]],
-            places=1,
+        _plot(
+            data_headers=["Demand", "Delivered", "Unmet", "Coil"],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Heat rate [W]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                4900,
+                5000,
+                [
+                    self.r["q_dem"],
+                    self.r["q_del_tank"],
+                    self.r["q_unmet_tank"],
+                    self.r["q_del_sol"],
+                ],
+            ),
+            outfile="sol_tank_com_new_heatrate_defpars_4per.png",
+            modes="lines",
         )
 
-        self.assertAlmostEqual(
-            sol_fra["annual"], cons_total.at[1, self.r["sol_fra"]], places=1
+        _plot(
+            data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Temperature [K]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                4900,
+                5000,
+                [self.r["t_tank_up"], self.r["t_tank_low"]],
+            ),
+            outfile="sol_tank_com_new_temp_defpars_4per.png",
+            modes="lines",
         )
 
-        if self.plot_results:
-            Plot(
-                data_headers=["Demand", "Delivered", "Unmet", "Coil"],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Heat rate [W]",
-            ).series(
-                ts_res.loc[
-                    4900:5000,
-                    [
-                        self.r["q_dem"],
-                        self.r["q_del_tank"],
-                        self.r["q_unmet_tank"],
-                        self.r["q_del_sol"],
-                    ],
-                ],
-                outfile="img/sol_tank_com_new_heatrate_defpars_4per.png",
-                modes="lines",
-            )
-
-            Plot(
-                data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Temperature [K]",
-            ).series(
-                ts_res.loc[
-                    4900:5000, [self.r["t_tank_up"], self.r["t_tank_low"]]
-                ],
-                outfile="img/sol_tank_com_new_temp_defpars_4per.png",
-                modes="lines",
-            )
-
     def test_solar_thermal_individual_retrofit(self):
         """Tests solar thermal project level model with
         a gas tank backup heater
@@ -779,73 +1032,76 @@ class SystemTests(unittest.TestCase):
                 backup_ts_cons,
                 rel_err,
             ],
-        ) = self.sol_wh_indiv_retr.solar_thermal(backup="retrofit")
+        ) = self._solar_thermal("sol_wh_indiv_retr", "retrofit")
 
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_bckp"]],
-            cons_total[self.r["q_del_bckp"]].sum(),
-            places=1,
-        )
+        q_del_bckp = proj_total[self.r["q_del_bckp"]]
+        el_use = proj_total[self.r["el_use"]]
 
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_bckp"]], 214742.0, places=1
-        )
+        # household totals
+        cons_sums = cons_total[[self.r["q_del_bckp"], self.r["el_use"]]].sum()
 
-        self.assertAlmostEqual(
-            proj_total[self.r["el_use"]],
-            cons_total[self.r["el_use"]].sum(),
-            places=1,
+        # (result, expected) pairs
+        self._assert_almost_equal_all(
+            [
+                (q_del_bckp, cons_sums[self.r["q_del_bckp"]]),
+                (q_del_bckp, 214742.0),
+                (el_use, cons_sums[self.r["el_use"]]),
+                (el_use, 54490.14),
+                (
+                    ts_res[self.r["q_dump"]].sum(),
+                    proj_total[self.r["q_dump"]],
+                ),
+                (sol_fra["annual"], cons_total.at[0, self.r["sol_fra"]]),
+            ]
         )
 
-        self.assertAlmostEqual(
-            proj_total[self.r["el_use"]], 54490.14, places=1
-        )
+    @unittest.skipUnless(_PLOT, "Plots are saved only with MSWH_PLOT=1.")
+    def test_solar_thermal_individual_retrofit_plot(self):
+        """Plots the timeseries results of the
+        individual retrofit solar thermal system.
+        """
+        # timeseries results
+        ts_res = self._solar_thermal("sol_wh_indiv_retr", "retrofit")[2][4]
 
-        self.assertAlmostEqual(
-            ts_res[self.r["q_dump"]].sum(),
-            proj_total[self.r["q_dump"]],
-            places=1,
+        _plot(
+            data_headers=["Demand", "Delivered", "Unmet", "Coil"],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Heat rate [W]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                4900,
+                5000,
+                [
+                    self.r["q_dem"],
+                    self.r["q_del_tank"],
+                    self.r["q_unmet_tank"],
+                    self.r["q_del_sol"],
+                ],
+            ),
+            outfile="sol_tank_retr_heatrate_defpars_4per.png",
+            modes="lines",
         )
 
-        self.assertAlmostEqual(
-            sol_fra["annual"], cons_total.at[0, self.r["sol_fra"]], places=1
+        _plot(
+            data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Temperature [K]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                4900,
+                5000,
+                [self.r["t_tank_up"], self.r["t_tank_low"]],
+            ),
+            outfile="sol_tank_retr_temp_defpars_4per.png",
+            modes="lines",
         )
 
-        if self.plot_results:
-            Plot(
-                data_headers=["Demand", "Delivered", "Unmet", "Coil"],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Heat rate [W]",
-            ).series(
-                ts_res.loc[
-                    4900:5000,
-                    [
-                        self.r["q_dem"],
-                        self.r["q_del_tank"],
-                        self.r["q_unmet_tank"],
-                        self.r["q_del_sol"],
-                    ],
-                ],
-                outfile="img/sol_tank_retr_heatrate_defpars_4per.png",
-                modes="lines",
-            )
-
-            Plot(
-                data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Temperature [K]",
-            ).series(
-                ts_res.loc[
-                    4900:5000, [self.r["t_tank_up"], self.r["t_tank_low"]]
-                ],
-                outfile="img/sol_tank_retr_temp_defpars_4per.png",
-                modes="lines",
-            )
-
     def test_solar_thermal_community_retrofit(self):
         """Tests solar thermal project level model with
         a gas tank backup heater
@@ -864,79 +1120,78 @@ class SystemTests(unittest.TestCase):
                 backup_ts_cons,
                 rel_err,
             ],
-        ) = self.sol_wh_com_retr.solar_thermal(backup="retrofit")
+        ) = self._solar_thermal("sol_wh_com_retr", "retrofit")
 
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_bckp"]],
-            cons_total[self.r["q_del_bckp"]].sum(),
-            places=1,
-        )
+        q_del_bckp = proj_total[self.r["q_del_bckp"]]
+        el_use = proj_total[self.r["el_use"]]
 
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_bckp"]], 846306.03, places=1
-        )
+        # household totals
+        cons_sums = cons_total[[self.r["q_del_bckp"], self.r["el_use"]]].sum()
 
-        self.assertAlmostEqual(
-            proj_total[self.r["el_use"]],
-            cons_total[self.r["el_use"]].sum(),
-            places=1,
+        # (result, expected) pairs
+        self._assert_almost_equal_all(
+            [
+                (q_del_bckp, cons_sums[self.r["q_del_bckp"]]),
+                (q_del_bckp, 846306.03),
+                (el_use, cons_sums[self.r["el_use"]]),
+                (el_use, 138084.38),
+                (
+                    ts_res[self.r["q_dump"]].sum(),
+                    proj_total[self.r["q_dump"]],
+                ),
+                (sol_fra["annual"], cons_total.at[1, self.r["sol_fra"]]),
+            ]
         )
 
-        self.assertAlmostEqual(
-            proj_total[self.r["el_use"]], 138084.38, places=1
-        )
+        # proj_total.to_csv('community_retrofit.csv')
 
-        self.assertAlmostEqual(
-            proj_total[self.r["q_del_bckp"]], 846306.03, places=1
-        )
+    @unittest.skipUnless(_PLOT, "Plots are saved only with MSWH_PLOT=1.")
+    def test_solar_thermal_community_retrofit_plot(self):
+        """Plots the timeseries results of the
+        community retrofit solar thermal system.
+        """
+        # timeseries results
+        ts_res = self._solar_thermal("sol_wh_com_retr", "retrofit")[2][4]
 
-        self.assertAlmostEqual(
-            ts_res[self.r["q_dump"]].sum(),
-            proj_total[self.r["q_dump"]],
-            places=1,
+        _plot(
+            data_headers=["Demand", "Delivered", "Unmet", "Coil"],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Heat rate [W]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                4900,
+                5000,
+                [
+                    self.r["q_dem"],
+                    self.r["q_del_tank"],
+                    self.r["q_unmet_tank"],
+                    self.r["q_del_sol"],
+                ],
+            ),
+            outfile="sol_tank_com_retr_heatrate_defpars_4per.png",
+            modes="lines",
         )
 
-        self.assertAlmostEqual(
-            sol_fra["annual"], cons_total.at[1, self.r["sol_fra"]], places=1
+        _plot(
+            data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Solar tank",
+            label_v="Temperature [K]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                4900,
+                5000,
+                [self.r["t_tank_up"], self.r["t_tank_low"]],
+            ),
+            outfile="sol_tank_com_retr_temp_defpars_4per.png",
+            modes="lines",
         )
 
-        if self.plot_results:
-            Plot(
-                data_headers=["Demand", "Delivered", "Unmet", "Coil"],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Heat rate [W]",
-            ).series(
-                ts_res.loc[
-                    4900:5000,
-                    [
-                        self.r["q_dem"],
-                        self.r["q_del_tank"],
-                        self.r["q_unmet_tank"],
-                        self.r["q_del_sol"],
-                    ],
-                ],
-                outfile="img/" "sol_tank_com_retr_heatrate_defpars_4per.png",
-                modes="lines",
-            )
-
-            Plot(
-                data_headers=[self.r["t_tank_up"], self.r["t_tank_low"]],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Solar tank",
-                label_v="Temperature [K]",
-            ).series(
-                ts_res.loc[
-                    4900:5000, [self.r["t_tank_up"], self.r["t_tank_low"]]
-                ],
-                outfile="img/sol_tank_com_retr_temp_defpars_4per.png",
-                modes="lines",
-            )
-
-        # proj_total.to_csv('community_retrofit.csv')
-
     def test_validate_solar_thermal(self):
         """Compares annual solar fraction and gas use savings
         with rating data (gas tankless backup)
@@ -967,7 +1222,7 @@ class SystemTests(unittest.TestCase):
                 backup_ts_cons,
                 rel_err,
             ],
-        ) = self.val_sol_wh.solar_thermal(backup="gas")
+        ) = self._solar_thermal("val_sol_wh", "gas")
 
         self.assertTrue(
             abs((sol_fra["annual"] - rated_SF) / sol_fra["annual"]) < 0.15
@@ -978,7 +1233,7 @@ class SystemTests(unittest.TestCase):
             bc_cons_total,
             bc_proj_total,
             bc_ts_proj,
-        ) = self.conv_wh_val.conventional_gas_tank()
+        ) = self._simulate("conv_wh_val", "conventional_gas_tank")
 
         self.assertTrue(
             abs(
@@ -1013,101 +1268,121 @@ class SystemTests(unittest.TestCase):
                 ts_res,
                 rel_err,
             ],
-        ) = self.hp_wh.solar_electric()
+        ) = self._simulate("hp_wh", "solar_electric")
 
-        if self.plot_results:
-            Plot(
-                data_headers=[
-                    "Demand",
-                    "HP del",
-                    "Aux del",
-                    "Tank del",
-                    "Unmet",
-                    "PV",
-                    "HP el. use",
-                    "Aux el. use",
-                ],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Heat pump tank with PV",
-                label_v="Power / Heatrate [W]",
-            ).series(
-                ts_res.loc[
-                    4920:5000,
-                    [
-                        self.r["q_dem"],
-                        self.r["q_del_hp"],
-                        self.r["q_del_bckp"],
-                        self.r["q_del_tank"],
-                        self.r["q_unmet_tank"],
-                        self.r["p_pv_ac"],
-                        self.r["p_hp_el_use"],
-                        self.r["p_el_res_use"],
-                    ],
-                ],
-                outfile="img/"
-                "hp_tank_pv_heatrate_defpars_4per_80gallons.png",
-                modes="lines",
-            )
+        self.assertAlmostEqual(sol_fra["annual"], 0.328, places=2)
 
-            Plot(
-                data_headers=["T_upper", "T_lower"],
-                outpath=self.outpath,
-                save_image=self.plot_results,
-                title="Heat pump tank",
-                label_v="Temperature [K]",
-            ).series(
-                ts_res.loc[
-                    4920:5000, [self.r["t_tank_up"], self.r["t_tank_low"]]
+    @unittest.skipUnless(_PLOT, "Plots are saved only with MSWH_PLOT=1.")
+    def test_solar_electric_plot(self):
+        """Plots the timeseries results of the
+        solar electric system.
+        """
+        # timeseries results
+        ts_res = self._simulate("hp_wh", "solar_electric")[2][4]
+
+        _plot(
+            data_headers=[
+                "Demand",
+                "HP del",
+                "Aux del",
+                "Tank del",
+                "Unmet",
+                "PV",
+                "HP el. use",
+                "Aux el. use",
+            ],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Heat pump tank with PV",
+            label_v="Power / Heatrate [W]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                4920,
+                5000,
+                [
+                    self.r["q_dem"],
+                    self.r["q_del_hp"],
+                    self.r["q_del_bckp"],
+                    self.r["q_del_tank"],
+                    self.r["q_unmet_tank"],
+                    self.r["p_pv_ac"],
+                    self.r["p_hp_el_use"],
+                    self.r["p_el_res_use"],
                 ],
-                outfile="img/hp_tank_temp_defpars_4per_80gallons.png",
-                modes="lines",
-            )
+            ),
+            outfile="hp_tank_pv_heatrate_defpars_4per_80gallons.png",
+            modes="lines",
+        )
 
-        self.assertAlmostEqual(sol_fra["annual"], 0.328, places=2)
+        _plot(
+            data_headers=["T_upper", "T_lower"],
+            outpath=self.outpath,
+            save_image=self.plot_results,
+            title="Heat pump tank",
+            label_v="Temperature [K]",
+        ).series(
+            _ts_columns(
+                ts_res,
+                4920,
+                5000,
+                [self.r["t_tank_up"], self.r["t_tank_low"]],
+            ),
+            outfile="hp_tank_temp_defpars_4per_80gallons.png",
+            modes="lines",
+        )
 
     def test_conventional_gas_tank(self):
         """Tests project level gas tank wh model"""
 
-        cons_total, proj_total, ts_proj = self.conv_wh.conventional_gas_tank()
+        cons_total, proj_total, ts_proj = self._simulate(
+            "conv_wh", "conventional_gas_tank"
+        )
 
-        Plot(
+        # (result, expected) pairs
+        self._assert_almost_equal_all(
+            [
+                # Gas use
+                (cons_total[self.r["gas_use"]][0], 4727451.89),
+                # Seasonal gas use
+                (
+                    cons_total[self.r["gas_use"]][0],
+                    cons_total[self.r["gas_use_s"]][0]
+                    + cons_total[self.r["gas_use_w"]][0],
+                ),
+            ]
+        )
+
+    @unittest.skipUnless(_PLOT, "Plots are saved only with MSWH_PLOT=1.")
+    def test_conventional_gas_tank_plot(self):
+        """Plots the timeseries gas use of the
+        conventional gas tank water heater.
+        """
+        # timeseries results
+        ts_proj = self._simulate("conv_wh", "conventional_gas_tank")[2]
+
+        _plot(
             data_headers=["Gas use"],
             outpath=self.outpath,
             save_image=self.plot_results,
             title="Gas tank water heater (WHAM)",
             label_v="Heat rate [W]",
         ).series(
-            [ts_proj[self.r["gas_use"]][4900:5000]],
-            outfile="img/gas_use_4per.png",
+            [ts_proj[self.r["gas_use"]].iloc[4900:5000]],
+            outfile="gas_use_4per.png",
             modes="lines",
         )
 
-        # Gas use
-        self.assertAlmostEqual(
-            cons_total[self.r["gas_use"]][0], 4727451.89, places=1
-        )
-
-        # Seasonal gas use
-        self.assertAlmostEqual(
-            cons_total[self.r["gas_use"]][0],
-            (
-                cons_total[self.r["gas_use_s"]][0]
-                + cons_total[self.r["gas_use_w"]][0]
-            ),
-            places=1,
-        )
-
     def test__split_utility(self):
         """Tests how cost or consumption gets
         assigned to households
         """
         df = pd.DataFrame(
+            np.array([[1, 2], [2, 3], [3, 4], [4, 3]], dtype=np.int64),
             columns=[
                 self.c["id"],
                 self.c["occ"],
             ],
-            data=[[1, 2], [2, 3], [3, 4], [4, 3]],
         )
 
         df = System._split_utility(
@@ -374,3 +374,99 @@ class SourceAndSinkTests(unittest.TestCase):
                 == wet_bulb_C.round(5)
             ).all()
         )
+
+    def test_demand_estimate(self):
+        """Tests the CSI demand estimate for scalar
+        and array occupancy inputs.
+        """
+        self.assertEqual(SourceAndSink.demand_estimate(1), 20.0)
+        self.assertEqual(SourceAndSink.demand_estimate(2.0), 35.0)
+        self.assertEqual(SourceAndSink.demand_estimate(4), 55.0)
+
+        occ = np.array([1.0, 2.0, 3.0, 4.0, 6.0])
+
+        self.assertTrue(
+            (
+                SourceAndSink.demand_estimate(occ)
+                == np.array([20.0, 35.0, 45.0, 55.0, 75.0])
+            ).all()
+        )
+
+    def test_make_example_loading_inputs_with_generator(self):
+        """Tests drawing example loads with a numpy
+        random generator.
+        """
+        occupancy = [4.0, 4.0, 3.0, 5.0]
+        at_home = ["n", "n", "n", "n"]
+
+        loads, household_info = SourceAndSink._make_example_loading_inputs(
+            self.weather.data,
+            self.c,
+            np.random.default_rng(123),
+            occupancy=occupancy,
+            at_home=at_home,
+        )
+
+        self.assertEqual(loads.shape[0], len(occupancy))
+        self.assertTrue((loads[self.c["occ"]].values == occupancy).all())
+        self.assertEqual(
+            household_info[self.c["ld_id"]].unique().size, len(occupancy)
+        )
+
+    def test_make_example_loading_inputs_max_load(self):
+        """Tests that the peak load skips missing hourly
+        load values.
+        """
+        inputs = {
+            self.c["exmp_loads"]: pd.DataFrame(
+                {self.c["hour"]: [1, 2, 3], "1": [1.0, np.nan, 3.0]}
+            ),
+            self.c["exmp_consload"]: pd.DataFrame(
+                {
+                    self.c["ld_id"]: [1],
+                    self.c["occ"]: [4.0],
+                    self.c["at_hm"]: ["n"],
+                }
+            ),
+        }
+
+        loads, household_info = SourceAndSink._make_example_loading_inputs(
+            inputs,
+            self.c,
+            np.random.default_rng(123),
+            occupancy=[4.0],
+            at_home=["n"],
+        )
+
+        self.assertEqual(household_info.at[0, self.c["max_load"]], 3.0)
+
+    def test_irradiation_and_water_main_cached(self):
+        """Tests that repeated calls return equal results
+        that can be modified independently.
+        """
+        first = self.weather.irradiation_and_water_main(
+            "03", method="isotropic diffuse"
+        )
+        expected = first.copy()
+        first[self.c["irrad_on_tilt"]] = 0.0
+
+        second = self.weather.irradiation_and_water_main(
+            "03", method="isotropic diffuse"
+        )
+
+        pd.testing.assert_frame_equal(second, expected)
+
+        # arrays packed into a single row
+        first = self.weather.irradiation_and_water_main(
+            "03", method="isotropic diffuse", single_row_with_arrays=True
+        )
+        expected = first.at[0, self.c["irrad_on_tilt"]].copy()
+        first.at[0, self.c["irrad_on_tilt"]][:] = 0.0
+
+        second = self.weather.irradiation_and_water_main(
+            "03", method="isotropic diffuse", single_row_with_arrays=True
+        )
+
+        self.assertTrue(
+            (second.at[0, self.c["irrad_on_tilt"]] == expected).all()
+        )
@@ -36,6 +36,25 @@ class UnitConvTests(unittest.TestCase):
             places=2,
         )
 
+    def test_degF_K(self):
+        """Tests temperature conversion between degF and K"""
+        t_degF = np.array([32.0, 212.0])
+        t_K = np.array([273.15, 373.15])
+
+        np.testing.assert_allclose(
+            UnitConv(t_degF).degF_K(unit_in="degF"), t_K, rtol=1e-12
+        )
+        np.testing.assert_allclose(
+            UnitConv(t_K).degF_K(unit_in="K"), t_degF, rtol=1e-12
+        )
+
+        # matches the conversion through degC
+        self.assertAlmostEqual(
+            UnitConv(70.3).degF_K(unit_in="degF"),
+            UnitConv(70.3).degF_degC(unit_in="degF") + 273.15,
+            places=10,
+        )
+
     def test_degC_K(self):
         """Tests temperature conversion between degC and K"""
         # say we're using water
@@ -5,6 +5,19 @@ import logging
 
 log = logging.getLogger(__name__)
 
+# Conversion factors, ASHRAE Fundamentals 2017. Use these
+# directly in place of UnitConv in frequently called models.
+ABS_ZERO = 273.15  # offset between K and degC
+F_TO_C_OFFSET = 32.0  # degF at 0 degC
+F_TO_C_SCALE = 5.0 / 9.0  # degC per degF
+F_TO_K_OFFSET = ABS_ZERO - F_TO_C_OFFSET * F_TO_C_SCALE  # K at 0 degF
+M3_PER_GAL = 0.003785412
+W_PER_HP = 745.7
+J_PER_BTU = 1055.056
+J_PER_WH = 3600.0
+S_PER_H = 3600.0
+M_PER_FT = 0.3048
+
 
 class UnitConv(object):
     """Unit conversions using conversion parameters from
@@ -106,9 +119,38 @@ class UnitConv(object):
         self.x_in *= self.scale_in
 
         if unit_in == "degF":
-            x_out = (self.x_in - 32.0) * (5.0 / 9.0)
+            x_out = (self.x_in - F_TO_C_OFFSET) * F_TO_C_SCALE
         elif unit_in == "degC":
-            x_out = (self.x_in * 9.0 / 5.0) + 32.0
+            x_out = (self.x_in * 9.0 / 5.0) + F_TO_C_OFFSET
+        else:
+            msg = "User provided an unsupported input unit {}."
+            log.error(msg.format(unit_in))
+            raise ValueError
+
+        x_out /= self.scale_out
+
+        return x_out
+
+    def degF_K(self, unit_in="degF"):
+        """Converts temperature between degree Fahrenheit and Kelvin
+        in a single scale and offset operation
+
+        Parameters:
+
+            unit_in: string, options: 'degF', 'K'
+                Unit of the input value
+
+        Returns:
+
+            x_out: float, array
+                Output value
+        """
+        self.x_in *= self.scale_in
+
+        if unit_in == "degF":
+            x_out = self.x_in * F_TO_C_SCALE + F_TO_K_OFFSET
+        elif unit_in == "K":
+            x_out = (self.x_in - F_TO_K_OFFSET) / F_TO_C_SCALE
         else:
             msg = "User provided an unsupported input unit {}."
             log.error(msg.format(unit_in))
@@ -133,12 +175,10 @@ class UnitConv(object):
         """
         self.x_in *= self.scale_in
 
-        abs_zero = 273.15
-
         if unit_in == "K":
-            x_out = self.x_in - abs_zero
+            x_out = self.x_in - ABS_ZERO
         elif unit_in == "degC":
-            x_out = self.x_in + abs_zero
+            x_out = self.x_in + ABS_ZERO
         else:
             msg = "User provided an unsupported input unit {}."
             log.error(msg.format(unit_in))
@@ -164,9 +204,9 @@ class UnitConv(object):
         self.x_in *= self.scale_in
 
         if unit_in == "gal":
-            x_out = self.x_in * 0.003785412
+            x_out = self.x_in * M3_PER_GAL
         elif unit_in == "m3":
-            x_out = self.x_in * (1.0 / 0.003785412)
+            x_out = self.x_in * (1.0 / M3_PER_GAL)
 
         x_out /= self.scale_out
 
@@ -188,9 +228,9 @@ class UnitConv(object):
         self.x_in *= self.scale_in
 
         if unit_in == "hp":
-            x_out = self.x_in * 745.7
+            x_out = self.x_in * W_PER_HP
         elif unit_in == "W":
-            x_out = self.x_in * 1.0 / 745.7
+            x_out = self.x_in * 1.0 / W_PER_HP
         else:
             msg = "User provided an unsupported input unit {}."
             log.error(msg.format(unit_in))
@@ -219,9 +259,9 @@ class UnitConv(object):
         self.x_in *= self.scale_in
 
         if unit_in == "Btu":
-            x_out = self.x_in * 1055.056
+            x_out = self.x_in * J_PER_BTU
         elif unit_in == "J":
-            x_out = self.x_in * (1.0 / 1055.056)
+            x_out = self.x_in * (1.0 / J_PER_BTU)
         else:
             msg = "User provided an unsupported input unit {}."
             log.error(msg.format(unit_in))
@@ -281,9 +321,9 @@ class UnitConv(object):
         self.x_in *= self.scale_in
 
         if unit_in == "Wh":
-            x_out = self.x_in * 3600.0
+            x_out = self.x_in * J_PER_WH
         elif unit_in == "J":
-            x_out = self.x_in / 3600.0
+            x_out = self.x_in / J_PER_WH
         else:
             msg = "User provided an unsupported input unit {}."
             log.error(msg.format(unit_in))
@@ -313,9 +353,9 @@ class UnitConv(object):
         self.x_in *= self.scale_in
 
         if unit_in == "m3perh":
-            x_out = self.x_in / 3600.0
+            x_out = self.x_in / S_PER_H
         elif unit_in == "m3pers":
-            x_out = self.x_in * 3600.0
+            x_out = self.x_in * S_PER_H
         else:
             msg = "User provided an unsupported input unit {}."
             log.error(msg.format(unit_in))
@@ -345,9 +385,9 @@ class UnitConv(object):
         self.x_in *= self.scale_in
 
         if unit_in == "sqft":
-            x_out = self.x_in * (0.3048 ** 2)
+            x_out = self.x_in * (M_PER_FT ** 2)
         elif unit_in == "m2":
-            x_out = self.x_in / (0.3048 ** 2)
+            x_out = self.x_in / (M_PER_FT ** 2)
         else:
             msg = "User provided an unsupported input unit {}."
             log.error(msg.format(unit_in))
@@ -377,9 +417,9 @@ class UnitConv(object):
         self.x_in *= self.scale_in
 
         if unit_in == "ft":
-            x_out = self.x_in * 0.3048
+            x_out = self.x_in * M_PER_FT
         elif unit_in == "m":
-            x_out = self.x_in / 0.3048
+            x_out = self.x_in / M_PER_FT
         else:
             msg = "User provided an unsupported input unit {}."
             log.error(msg.format(unit_in))